@@ -0,0 +1,115 @@
+"""Benchmark: rows/second of the columnar MessagePack path vs the JSON batch path.
+
+Runs the full ASGI app in-process (rate limiting and the prediction log are
+disabled so only parsing, validation, inference and encoding are measured).
+
+Usage (from backend/):
+    python -m benchmarks.columnar_vs_json
+"""
+
+import os
+import time
+
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("PREDICTION_LOG_ENABLED", "false")
+
+import msgpack  # noqa: E402
+import numpy as np  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from main import app  # noqa: E402
+
+JSON_MAX_ROWS = 1000
+SIZES = (100, 1000, 10_000, 100_000)
+REPEATS = 5
+
+
+def make_rows(n: int, locations: list[str], seed: int = 0) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    total_floors = rng.integers(2, 40, n)
+    return {
+        "location": rng.choice(locations, n),
+        "area_sqft": rng.uniform(400, 3000, n).round(1),
+        "bhk": rng.integers(1, 5, n),
+        "bathrooms": rng.integers(1, 5, n).astype(float),
+        "floor": rng.integers(0, total_floors),
+        "total_floors": total_floors,
+        "age_of_property": rng.uniform(0, 30, n).round(1),
+        "parking": rng.integers(0, 2, n),
+        "lift": rng.integers(0, 2, n),
+    }
+
+
+def json_body(columns: dict[str, np.ndarray]) -> dict:
+    keys = list(columns)
+    return {
+        "items": [
+            {
+                **dict(zip(keys, values)),
+                "parking": bool(values[keys.index("parking")]),
+                "lift": bool(values[keys.index("lift")]),
+            }
+            for values in zip(*(columns[k].tolist() for k in keys))
+        ]
+    }
+
+
+def columnar_body(columns: dict[str, np.ndarray]) -> bytes:
+    payload = {"location": columns["location"].tolist()}
+    for name, values in columns.items():
+        if name != "location":
+            payload[name] = np.asarray(values, dtype="<f8").tobytes()
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def best_time(fn) -> float:
+    fn()  # warm up
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    with TestClient(app) as client:
+        locations = client.get("/api/v1/metadata").json()["locations"]
+        print(f"{'rows':>8s} {'json rows/s':>14s} {'columnar rows/s':>16s} {'speedup':>8s}")
+        for n in SIZES:
+            columns = make_rows(n, locations)
+
+            binary = columnar_body(columns)
+
+            def run_columnar():
+                response = client.post(
+                    "/api/v1/predict/columnar",
+                    content=binary,
+                    headers={"Content-Type": "application/msgpack"},
+                )
+                response.raise_for_status()
+                msgpack.unpackb(response.content)
+
+            columnar_rps = n / best_time(run_columnar)
+
+            json_rps = None
+            if n <= JSON_MAX_ROWS:
+                body = json_body(columns)
+
+                def run_json():
+                    response = client.post("/api/v1/predict/batch", json=body)
+                    response.raise_for_status()
+                    response.json()
+
+                json_rps = n / best_time(run_json)
+
+            print(
+                f"{n:8d} "
+                f"{f'{json_rps:,.0f}' if json_rps else 'n/a':>14s} "
+                f"{columnar_rps:16,.0f} "
+                f"{f'{columnar_rps / json_rps:.1f}x' if json_rps else '':>8s}"
+            )
+
+
+if __name__ == "__main__":
+    main()
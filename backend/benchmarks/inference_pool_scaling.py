@@ -0,0 +1,65 @@
+"""Benchmark: in-process scoring vs the shared-memory process pool.
+
+Scores synthetic batches in-process and through ``InferencePool`` with
+1, 2, 4, ... workers (up to the machine's core count) and reports rows/second
+and speedup over in-process. The smallest batch size where the pool wins
+is a good value for ``INFERENCE_POOL_MIN_ROWS``.
+
+Usage (from backend/):
+    python -m benchmarks.inference_pool_scaling
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.columnar_vs_json import best_time, make_rows
+from services.inference_pool import InferencePool
+from services.ml_service import ModelService
+
+MODEL_PATH = Path(__file__).resolve().parent.parent / "model.pkl"
+SIZES = (5_000, 20_000, 100_000)
+
+
+def worker_counts() -> list[int]:
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def main() -> None:
+    ModelService.load()
+    pipeline = ModelService._pipeline
+    locations = ModelService.get_metadata()["locations"]
+    frames = {
+        n: ModelService._frame_from_columns(
+            {k: np.asarray(v) for k, v in make_rows(n, locations).items()}
+        )
+        for n in SIZES
+    }
+
+    print(f"CPU cores: {os.cpu_count()}")
+    header = f"{'rows':>8s} {'workers':>8s} {'rows/s':>12s} {'speedup':>8s}"
+    print(f"{header}\n{'-' * len(header)}")
+    baseline = {}
+    for n, frame in frames.items():
+        baseline[n] = n / best_time(lambda: pipeline.predict(frame))
+        print(f"{n:8d} {'in-proc':>8s} {baseline[n]:12,.0f} {'1.0x':>8s}")
+
+    for workers in worker_counts():
+        pool = InferencePool(MODEL_PATH, workers=workers, min_rows=0)
+        try:
+            for n, frame in frames.items():
+                rps = n / best_time(lambda: pool.predict(frame))
+                print(f"{n:8d} {workers:8d} {rps:12,.0f} {rps / baseline[n]:7.1f}x")
+        finally:
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark: location validation cost as the number of locations grows.
+
+Compares the previous approach (lower-casing ``metadata["locations"]`` and
+scanning it on every request) with ``LocationIndex`` exact and one-typo
+lookups, and reports the index build time and memory.
+
+Usage (from backend/):
+    python -m benchmarks.location_lookup
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from services.locations import LocationIndex
+
+SIZES = (10, 1_000, 10_000, 50_000)
+LOOKUPS = 2_000
+
+
+def linear_scan(locations: list[str], name: str) -> bool:
+    known = [loc.lower() for loc in locations]
+    return name.lower() in known
+
+
+def per_lookup_us(fn, names: list[str]) -> float:
+    start = time.perf_counter()
+    for name in names:
+        fn(name)
+    return (time.perf_counter() - start) / len(names) * 1e6
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    header = (
+        f"{'locations':>9s} {'build ms':>9s} {'index MB':>9s} {'scan us':>9s} "
+        f"{'exact us':>9s} {'typo us':>8s}"
+    )
+    print(f"{header}\n{'-' * len(header)}")
+    for n in SIZES:
+        locations = [f"Sector {i} Society {i * 7919 % 100_000}" for i in range(n)]
+        queries = [locations[i] for i in rng.integers(0, n, LOOKUPS)]
+        # Drop a letter: typos in numbered words are never auto-resolved.
+        typos = [q.replace("Society", "Socety") for q in queries]
+
+        start = time.perf_counter()
+        index = LocationIndex(locations)
+        build_ms = (time.perf_counter() - start) * 1000
+        tracemalloc.start()
+        LocationIndex(locations)
+        index_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+
+        scan_queries = queries[: max(10, LOOKUPS * 10 // n)]
+        print(
+            f"{n:9d} {build_ms:9.1f} {index_mb:9.1f} "
+            f"{per_lookup_us(lambda q: linear_scan(locations, q), scan_queries):9.1f} "
+            f"{per_lookup_us(index.resolve, queries):9.2f} "
+            f"{per_lookup_us(index.resolve, typos):8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
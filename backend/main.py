@@ -15,8 +15,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
-from routers import analytics, health, predict
+from routers import analytics, health, monitoring, predict
+from services.admission import INFERENCE, AdmissionController
+from services.drift import DriftMonitor
+from services.fallback import FallbackEstimator, ModelCallExecutor
 from services.ml_service import ModelService
+from services.prediction_log import PredictionLog
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -38,8 +42,15 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Navi Mumbai House Price Prediction API...")
     ModelService.load()
     logger.info("ML model loaded successfully.")
+    DriftMonitor.configure(ModelService.get_metadata())
+    FallbackEstimator.configure(ModelService.get_metadata())
+    ModelCallExecutor.start()
+    await PredictionLog.start()
     yield
     logger.info("Shutting down API.")
+    await PredictionLog.stop()
+    ModelCallExecutor.shutdown()
+    ModelService.shutdown()
 
 
 # ---------------------------------------------------------------------------
@@ -60,9 +71,54 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    import os
+
+    # --- Admission control (rate limiting + load shedding) ---
+    # Registered before CORS so that 429/503 responses still carry CORS headers.
+    if os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true":
+        admission = AdmissionController.from_env()
+        application.state.admission = admission
+
+        @application.middleware("http")
+        async def admission_control(request: Request, call_next):
+            endpoint_class = admission.classify(request.method, request.url.path)
+            if endpoint_class is None:
+                return await call_next(request)
+
+            client = admission.client_key(
+                request.headers, request.client.host if request.client else None
+            )
+            decision = admission.check_rate(endpoint_class, client)
+            headers = admission.headers(decision)
+            if not decision.allowed:
+                return JSONResponse(
+                    status_code=429,
+                    content={"detail": "Rate limit exceeded. Please slow down."},
+                    headers=headers,
+                )
+
+            if endpoint_class != INFERENCE:
+                admission.stats["admitted"] += 1
+                response = await call_next(request)
+                response.headers.update(headers)
+                return response
+
+            if not await admission.acquire_slot():
+                return JSONResponse(
+                    status_code=503,
+                    content={"detail": "Server is busy. Please retry shortly."},
+                    headers={**headers, "Retry-After": "1"},
+                )
+            try:
+                admission.stats["admitted"] += 1
+                response = await call_next(request)
+            finally:
+                admission.release_slot()
+            response.headers.update(headers)
+            return response
+
     # --- CORS ---
     # In production, specify your actual origins.
-    import os
     allowed_origins_str = os.getenv(
         "ALLOWED_ORIGINS",
         "*"  # Allow all origins by default for easier deployment
@@ -116,6 +172,7 @@ def create_app() -> FastAPI:
     application.include_router(health.router, tags=["Health"])
     application.include_router(predict.router, prefix="/api/v1", tags=["Prediction"])
     application.include_router(analytics.router, prefix="/api/v1", tags=["Analytics"])
+    application.include_router(monitoring.router, prefix="/api/v1", tags=["Monitoring"])
 
     return application
 
@@ -84,9 +84,26 @@ class PredictionRequest(BaseModel):
         }
 
 
+class PredictionExplanation(BaseModel):
+    """Per-prediction SHAP attributions for the raw model output."""
+
+    base_value_inr: float = Field(
+        ..., description="Expected model output over the training data"
+    )
+    contributions_inr: dict[str, float] = Field(
+        ...,
+        description=(
+            "Signed contribution of each input feature in INR, largest first. "
+            "base_value_inr plus all contributions equals the unclamped model output."
+        ),
+    )
+
+
 class PredictionResponse(BaseModel):
     """Price prediction result."""
 
+    model_config = {"protected_namespaces": ()}
+
     predicted_price_inr: float = Field(
         ..., description="Predicted property price in INR"
     )
@@ -106,7 +123,42 @@ class PredictionResponse(BaseModel):
     location: str
     area_sqft: float
     bhk: int
-    model_version: str = "1.0.0"
+    model_version: str = Field(
+        default="unknown",
+        description="Model version from metadata, or 'fallback' when degraded",
+    )
+    explanation: PredictionExplanation | None = Field(
+        default=None, description="Feature attributions (only when explain=true)"
+    )
+    degraded: bool = Field(
+        default=False,
+        description=(
+            "True when the model missed the request deadline and the price is a "
+            "price-per-sqft table estimate instead of a model prediction"
+        ),
+    )
+    fallback_basis: str | None = Field(
+        default=None,
+        description="Table level of a degraded estimate: location_bhk, location or overall",
+    )
+
+
+class BatchPredictionRequest(BaseModel):
+    """A batch of properties to score in one call."""
+
+    items: list[PredictionRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="Properties to price (1–1000 per request)",
+    )
+
+
+class BatchPredictionResponse(BaseModel):
+    """Batch price prediction results, in request order."""
+
+    predictions: list[PredictionResponse]
+    count: int
 
 
 class HealthResponse(BaseModel):
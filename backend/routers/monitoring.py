@@ -0,0 +1,47 @@
+"""Monitoring router: /api/v1/monitoring/drift and /api/v1/monitoring/metrics."""
+
+import logging
+
+from fastapi import APIRouter, Request
+
+from services.drift import DriftMonitor
+from services.fallback import FallbackEstimator
+from services.live_pricing import LiveSession
+from services.prediction_log import PredictionLog
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/monitoring")
+
+
+@router.get(
+    "/drift",
+    summary="Feature drift",
+    description=(
+        "Compares the distribution of recently served requests with the "
+        "training data: per-feature PSI and KS scores, share of values outside "
+        "the training range, and location mix shift."
+    ),
+)
+async def feature_drift() -> dict:
+    """Return drift scores of live traffic against the training reference."""
+    return DriftMonitor.report()
+
+
+@router.get(
+    "/metrics",
+    summary="Serving counters",
+    description=(
+        "Process-local counters since startup: model vs degraded fallback "
+        "predictions and deadline misses, admission control decisions, "
+        "prediction log throughput and live pricing sessions."
+    ),
+)
+async def serving_metrics(request: Request) -> dict:
+    """Return counters from the serving components of this worker."""
+    admission = getattr(request.app.state, "admission", None)
+    return {
+        "predictions": FallbackEstimator.stats,
+        "admission": admission.stats if admission is not None else None,
+        "prediction_log": PredictionLog.stats,
+        "live_pricing": LiveSession.stats,
+    }
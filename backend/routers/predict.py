@@ -1,82 +1,500 @@
-"""Prediction router: /api/v1/predict and /api/v1/metadata."""
+"""Prediction router: /api/v1/predict, /api/v1/predict/batch,
+/api/v1/predict/columnar, /api/v1/predict/live (WebSocket) and
+/api/v1/metadata."""
 
+import asyncio
 import logging
+import time
+from functools import partial
+from typing import Callable, TypeVar
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    status,
+)
+from pydantic import ValidationError
 
-from models.prediction import MetadataResponse, PredictionRequest, PredictionResponse
+from models.prediction import (
+    BatchPredictionRequest,
+    BatchPredictionResponse,
+    MetadataResponse,
+    PredictionRequest,
+    PredictionResponse,
+)
+from services import columnar
+from services.admission import INFERENCE
+from services.drift import DriftMonitor
+from services.fallback import (
+    DeadlineExpired,
+    FallbackEstimator,
+    ModelCallExecutor,
+    request_deadline_s,
+)
+from services.live_pricing import LiveSession
 from services.ml_service import ModelService
+from services.prediction_log import PredictionLog
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+T = TypeVar("T")
+
+
+def _ensure_ready(explain: bool) -> None:
+    """Raise if the model (or the explainer, when requested) is unavailable."""
+    if not ModelService.is_loaded():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="ML model is not ready. Please try again in a few seconds.",
+        )
+    if explain and not ModelService.can_explain():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Explanations are not supported by the currently loaded model.",
+        )
+
+
+def _validate_location(location: str) -> str:
+    """Resolve a location (case, punctuation and one-typo tolerant) to its canonical name."""
+    index = ModelService.location_index()
+    canonical = index.resolve(location)
+    if canonical is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=index.unknown_message(location),
+        )
+    return canonical
+
+
+def _to_row(request: PredictionRequest, location: str) -> dict:
+    """Convert a validated request into ModelService keyword arguments."""
+    return {
+        "location": location,
+        "area_sqft": request.area_sqft,
+        "bhk": int(request.bhk),
+        "bathrooms": request.bathrooms,
+        "floor": request.floor,
+        "total_floors": request.total_floors,
+        "age_of_property": request.age_of_property,
+        "parking": request.parking,
+        "lift": request.lift,
+    }
+
+
+def _discard(task: asyncio.Future) -> None:
+    """Done-callback for abandoned model calls: log failures, drop results."""
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None and not isinstance(exc, DeadlineExpired):
+        logger.error("Abandoned prediction failed: %s", exc)
+
+
+async def _call_model(
+    model_call: Callable[[], T],
+    fallback: Callable[[], T] | None,
+    n_rows: int,
+    deadline_s: float | None,
+) -> tuple[T, bool]:
+    """Run a model call off the event loop, or ``fallback()`` if it is late.
+
+    The model runs on :class:`ModelCallExecutor`. When the pool already has
+    its maximum of calls in flight, the fallback is served without
+    submitting another one. With no deadline (or no fallback table) the
+    call is still offloaded, and awaited however long it takes.
+
+    A ``fallback`` of None makes the deadline strict: the result has no
+    acceptable substitute, so a refused or late call is abandoned and
+    :class:`DeadlineExpired` raised instead.
+
+    Returns:
+        ``(result, degraded)``.
+    """
+    stats = FallbackEstimator.stats
+    strict = fallback is None
+    can_degrade = not strict and FallbackEstimator.is_available()
+    abandon = deadline_s is not None and (strict or can_degrade)
+    future = ModelCallExecutor.submit(
+        model_call,
+        # Only calls that can be abandoned are refused or skipped.
+        deadline=time.monotonic() + deadline_s if abandon else None,
+    )
+    if future is None:
+        if strict:
+            raise DeadlineExpired("Model call pool saturated.")
+        stats["fallback"] += 1
+        logger.warning("Model call pool saturated; serving fallback for %d rows.", n_rows)
+        return fallback(), True
+
+    task = asyncio.wrap_future(future)
+    done, _ = await asyncio.wait({task}, timeout=deadline_s)
+    if not done or isinstance(task.exception(), DeadlineExpired):
+        stats["deadline_exceeded"] += 1
+        if abandon:
+            task.add_done_callback(_discard)
+            if strict:
+                raise DeadlineExpired(f"Model missed {deadline_s * 1000:.0f} ms deadline.")
+            stats["fallback"] += 1
+            logger.warning(
+                "Model missed %.0f ms deadline; serving fallback for %d rows.",
+                deadline_s * 1000,
+                n_rows,
+            )
+            return fallback(), True
+        stats["fallback_unavailable"] += 1
+    result = await task
+    stats["model"] += 1
+    return result, False
+
+
+async def _predict_within_deadline(
+    rows: list[dict], explain: bool, deadline_s: float | None
+) -> tuple[list[dict], bool]:
+    """Score rows with the model, or the fallback table if it misses the deadline.
+
+    Table estimates cannot be explained, so with ``explain`` a missed
+    deadline raises :class:`DeadlineExpired` instead of degrading.
+
+    Returns:
+        ``(results, degraded)``.
+    """
+    return await _call_model(
+        partial(ModelService.predict_batch, rows, explain),
+        None if explain else lambda: [ModelService.fallback_prediction(row) for row in rows],
+        len(rows),
+        deadline_s,
+    )
+
+
+def _explain_timeout(exc: DeadlineExpired) -> HTTPException:
+    """504 for an explained prediction that could not finish in time."""
+    logger.warning("Explained prediction abandoned: %s", exc)
+    return HTTPException(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        detail=(
+            "Explanation could not be computed within the deadline. Retry "
+            "without explain=true or with a larger X-Deadline-Ms."
+        ),
+    )
+
+
+_DEADLINE_HEADER = Header(
+    None,
+    alias="X-Deadline-Ms",
+    ge=1,
+    description=(
+        "Milliseconds the model may take before a degraded table estimate is "
+        "returned instead (capped server-side)"
+    ),
+)
+
 
 @router.post(
     "/predict",
     response_model=PredictionResponse,
+    response_model_exclude_none=True,
     summary="Predict house price",
     description=(
         "Accepts property features and returns a predicted price in INR "
-        "using the trained GradientBoosting model."
+        "using the trained GradientBoosting model. Pass `explain=true` to "
+        "include per-feature SHAP attributions. If the model misses the request "
+        "deadline, a price-per-sqft table estimate is returned with "
+        "`degraded=true`, or 504 when explanations were requested."
     ),
 )
-async def predict_price(request: PredictionRequest) -> PredictionResponse:
+async def predict_price(
+    request: PredictionRequest,
+    explain: bool = Query(False, description="Include per-feature attributions"),
+    deadline_ms: int | None = _DEADLINE_HEADER,
+) -> PredictionResponse:
     """Predict property price for given feature inputs.
 
     Args:
         request: Validated prediction request body.
+        explain: Whether to attach tree SHAP attributions to the response.
+        deadline_ms: Caller's deadline from ``X-Deadline-Ms``, if any.
 
     Returns:
         PredictionResponse with price in multiple formats.
 
     Raises:
         HTTPException 503: If model not loaded.
+        HTTPException 501: If explain is requested but unsupported by the model.
+        HTTPException 504: If explain is requested and the model misses the deadline.
         HTTPException 422: If inputs fail validation (auto-raised by FastAPI).
         HTTPException 500: On unexpected inference error.
     """
-    if not ModelService.is_loaded():
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="ML model is not ready. Please try again in a few seconds.",
+    _ensure_ready(explain)
+    row = _to_row(request, _validate_location(request.location))
+    start = time.perf_counter()
+    try:
+        (result,), degraded = await _predict_within_deadline(
+            [row], explain, request_deadline_s(deadline_ms)
         )
+    except DeadlineExpired as exc:
+        raise _explain_timeout(exc) from exc
+    except Exception as exc:
+        logger.error("Prediction failed: %s", exc, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Prediction failed. Please check your inputs and try again.",
+        ) from exc
 
-    # Validate location against known locations
-    metadata = ModelService.get_metadata()
-    known_locations = [loc.lower() for loc in metadata.get("locations", [])]
-    if known_locations and request.location.lower() not in known_locations:
+    model_version = (
+        "fallback"
+        if degraded
+        else ModelService.get_metadata().get("model_version", "unknown")
+    )
+    DriftMonitor.observe([row])
+    PredictionLog.record(
+        endpoint="predict",
+        inputs=row,
+        predicted_price_inr=result["predicted_price_inr"],
+        model_version=model_version,
+        latency_ms=(time.perf_counter() - start) * 1000,
+    )
+    return PredictionResponse(
+        **result,
+        location=row["location"],
+        area_sqft=request.area_sqft,
+        bhk=int(request.bhk),
+        model_version=model_version,
+    )
+
+
+@router.post(
+    "/predict/batch",
+    response_model=BatchPredictionResponse,
+    response_model_exclude_none=True,
+    summary="Predict house prices in bulk",
+    description=(
+        "Scores up to 1000 properties in a single vectorised model call. "
+        "Pass `explain=true` to include per-feature SHAP attributions (batches "
+        "of up to `EXPLAIN_MAX_ROWS`, default 250). If the model misses the "
+        "request deadline, every item is a table estimate with "
+        "`degraded=true`, or 504 when explanations were requested."
+    ),
+)
+async def predict_batch(
+    request: BatchPredictionRequest,
+    explain: bool = Query(False, description="Include per-feature attributions"),
+    deadline_ms: int | None = _DEADLINE_HEADER,
+) -> BatchPredictionResponse:
+    """Predict prices for a batch of properties, preserving input order."""
+    _ensure_ready(explain)
+    max_explain_rows = ModelService.max_explain_rows()
+    if explain and len(request.items) > max_explain_rows:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=(
-                f"Unknown location: '{request.location}'. "
-                f"Valid locations: {metadata.get('locations', [])}"
+                f"explain=true supports at most {max_explain_rows} items per "
+                f"batch; got {len(request.items)}."
             ),
         )
+    rows = [_to_row(item, _validate_location(item.location)) for item in request.items]
+    start = time.perf_counter()
+    try:
+        results, degraded = await _predict_within_deadline(
+            rows, explain, request_deadline_s(deadline_ms)
+        )
+    except DeadlineExpired as exc:
+        raise _explain_timeout(exc) from exc
+    except Exception as exc:
+        logger.error("Batch prediction failed: %s", exc, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Prediction failed. Please check your inputs and try again.",
+        ) from exc
 
+    # Latency is amortised over the rows of the batch.
+    latency_ms = (time.perf_counter() - start) * 1000 / len(rows)
+    model_version = (
+        "fallback"
+        if degraded
+        else ModelService.get_metadata().get("model_version", "unknown")
+    )
+    DriftMonitor.observe(rows)
+    for row, result in zip(rows, results):
+        PredictionLog.record(
+            endpoint="predict_batch",
+            inputs=row,
+            predicted_price_inr=result["predicted_price_inr"],
+            model_version=model_version,
+            latency_ms=latency_ms,
+        )
+
+    predictions = [
+        PredictionResponse(
+            **result,
+            location=row["location"],
+            area_sqft=row["area_sqft"],
+            bhk=row["bhk"],
+            model_version=model_version,
+        )
+        for row, result in zip(rows, results)
+    ]
+    return BatchPredictionResponse(predictions=predictions, count=len(predictions))
+
+
+@router.post(
+    "/predict/columnar",
+    summary="Predict house prices from a columnar binary batch",
+    description=(
+        "High-throughput path for internal callers. Accepts a MessagePack map "
+        "of feature columns (float64 `bin` payloads or arrays, up to "
+        f"{columnar.MAX_ROWS:,} rows) and returns MessagePack float64 columns "
+        "`predicted_price_inr` and `price_per_sqft_inr`. Large batches take "
+        "longer than the default deadline, so none applies unless the caller "
+        "sends `X-Deadline-Ms`; past it, the response is a table estimate with "
+        "`degraded=true`."
+    ),
+    response_class=Response,
+    responses={200: {"content": {columnar.MEDIA_TYPE: {}}}},
+)
+async def predict_columnar(
+    request: Request, deadline_ms: int | None = _DEADLINE_HEADER
+) -> Response:
+    """Score a columnar batch without per-row validation or JSON encoding.
+
+    Raises:
+        HTTPException 415: If the body is not ``application/msgpack``.
+        HTTPException 422: If a column is missing, malformed or out of range.
+        HTTPException 503: If model not loaded.
+    """
+    _ensure_ready(explain=False)
+    if request.headers.get("content-type", "").split(";")[0].strip() != columnar.MEDIA_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Expected Content-Type: {columnar.MEDIA_TYPE}",
+        )
+
+    metadata = ModelService.get_metadata()
+    try:
+        columns = columnar.decode_batch(await request.body(), ModelService.location_index())
+    except columnar.ColumnarError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
+
+    start = time.perf_counter()
     try:
-        result = ModelService.predict(
-            location=request.location,
-            area_sqft=request.area_sqft,
-            bhk=int(request.bhk),
-            bathrooms=request.bathrooms,
-            floor=request.floor,
-            total_floors=request.total_floors,
-            age_of_property=request.age_of_property,
-            parking=request.parking,
-            lift=request.lift,
+        prices, degraded = await _call_model(
+            partial(ModelService.predict_columns, columns),
+            partial(ModelService.fallback_columns, columns),
+            len(columns["location"]),
+            request_deadline_s(deadline_ms) if deadline_ms is not None else None,
         )
     except Exception as exc:
-        logger.error("Prediction failed: %s", exc, exc_info=True)
+        logger.error("Columnar prediction failed: %s", exc, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Prediction failed. Please check your inputs and try again.",
         ) from exc
 
-    return PredictionResponse(
+    model_version = "fallback" if degraded else metadata.get("model_version", "unknown")
+    DriftMonitor.observe_columns(columns)
+    PredictionLog.record_columns(
+        endpoint="predict_columnar",
+        columns=columns,
+        predicted_price_inr=prices,
+        model_version=model_version,
+        latency_ms=(time.perf_counter() - start) * 1000 / len(prices),
+    )
+    return Response(
+        content=columnar.encode_predictions(
+            prices, columns["area_sqft"], model_version, degraded
+        ),
+        media_type=columnar.MEDIA_TYPE,
+    )
+
+
+async def _score_live(state: dict) -> dict:
+    """Validate and score the merged feature state of a live session.
+
+    Inference goes through the same deadline and fallback path as /predict.
+    """
+    try:
+        request = PredictionRequest.model_validate(state)
+        location = _validate_location(request.location)
+    except ValidationError as exc:
+        return {
+            "type": "error",
+            "detail": exc.errors(include_url=False, include_context=False),
+        }
+    except HTTPException as exc:
+        return {"type": "error", "detail": exc.detail}
+
+    row = _to_row(request, location)
+    start = time.perf_counter()
+    try:
+        (result,), degraded = await _predict_within_deadline(
+            [row], False, request_deadline_s(None)
+        )
+    except Exception as exc:
+        logger.error("Live prediction failed: %s", exc, exc_info=True)
+        return {"type": "error", "detail": "Prediction failed."}
+
+    model_version = (
+        "fallback"
+        if degraded
+        else ModelService.get_metadata().get("model_version", "unknown")
+    )
+    DriftMonitor.observe([row])
+    PredictionLog.record(
+        endpoint="predict_live",
+        inputs=row,
+        predicted_price_inr=result["predicted_price_inr"],
+        model_version=model_version,
+        latency_ms=(time.perf_counter() - start) * 1000,
+    )
+    prediction = PredictionResponse(
         **result,
-        location=request.location,
+        location=location,
         area_sqft=request.area_sqft,
         bhk=int(request.bhk),
+        model_version=model_version,
     )
+    return {"type": "prediction", "prediction": prediction.model_dump(exclude_none=True)}
+
+
+@router.websocket("/predict/live")
+async def predict_live(websocket: WebSocket) -> None:
+    """Stream prices for partial feature updates over one persistent connection.
+
+    Opening a session costs one inference token from the caller's bucket;
+    updates within the session are debounced and coalesced server-side (see
+    ``services.live_pricing``), so scoring stays bounded per connection.
+    Closes with 1008 when rate limited and 1013 when the model is not ready
+    or the global or per-client session cap is reached.
+    """
+    client_host = websocket.client.host if websocket.client else None
+    admission = getattr(websocket.app.state, "admission", None)
+    if admission is not None:
+        client = admission.client_key(websocket.headers, client_host)
+        if not admission.check_rate(INFERENCE, client).allowed:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+    else:
+        client = f"ip:{client_host or 'unknown'}"
+    if not ModelService.is_loaded() or not LiveSession.reserve(client):
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
+    session = LiveSession.from_env(
+        websocket, client, _score_live, set(PredictionRequest.model_fields)
+    )
+    try:
+        await websocket.accept()
+    except BaseException:
+        LiveSession.release(client)
+        raise
+    await session.run()
 
 
 @router.get(
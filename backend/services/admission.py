@@ -0,0 +1,213 @@
+"""Admission control: per-client token buckets and a global inference cap.
+
+Keeps a single integration partner from monopolising the worker. Every
+request is classified as ``inference`` (model calls), ``read`` (cheap
+metadata/analytics) or exempt (health checks, docs, CORS preflight).
+Each class has its own token bucket per client, keyed by ``X-API-Key``
+when the key is in the ``API_KEYS`` allowlist and the client IP otherwise
+(so callers cannot mint fresh buckets by sending random keys). The IP is
+the TCP peer unless ``TRUST_PROXY_HEADERS`` is set, in which case it is
+taken from ``X-Forwarded-For``. Inference requests additionally
+pass a global concurrency cap; a request that cannot start within
+``max_queue_ms`` is shed with 503 instead of adding to everyone's latency.
+
+State is in-memory with O(1) work per request. The bucket store sits
+behind :class:`RateLimitBackend` so a shared store (e.g. Redis) can be
+swapped in for multi-worker deployments.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+INFERENCE = "inference"
+READ = "read"
+
+_EXEMPT_PATHS = ("/health", "/docs", "/redoc", "/openapi.json")
+_INFERENCE_PREFIXES = ("/api/v1/predict",)
+
+
+@dataclass(frozen=True)
+class BucketPolicy:
+    """Sustained refill rate (tokens/second) and burst capacity."""
+
+    rate: float
+    burst: int
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Outcome of a token-bucket check, with values for RateLimit-* headers."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # seconds until the bucket is full again
+    retry_after: float  # seconds until one token is available (0 if allowed)
+
+
+class RateLimitBackend(ABC):
+    """Storage for token buckets."""
+
+    @abstractmethod
+    def consume(self, key: str, policy: BucketPolicy, cost: float = 1.0) -> Decision:
+        """Try to take ``cost`` tokens from the bucket identified by ``key``."""
+
+
+class InMemoryBackend(RateLimitBackend):
+    """Process-local token buckets, bounded to ``max_keys`` (LRU eviction)."""
+
+    def __init__(self, max_keys: int = 10_000) -> None:
+        self._max_keys = max_keys
+        # key -> (tokens, last_refill_monotonic)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def consume(self, key: str, policy: BucketPolicy, cost: float = 1.0) -> Decision:
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(key, (float(policy.burst), now))
+        tokens = min(policy.burst, tokens + (now - last) * policy.rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self._max_keys:
+            self._buckets.popitem(last=False)
+
+        return Decision(
+            allowed=allowed,
+            limit=policy.burst,
+            remaining=int(tokens),
+            reset_after=(policy.burst - tokens) / policy.rate,
+            retry_after=0.0 if allowed else (cost - tokens) / policy.rate,
+        )
+
+
+class AdmissionController:
+    """Applies per-client rate limits and the global inference concurrency cap."""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        policies: dict[str, BucketPolicy],
+        max_concurrent_inference: int,
+        max_queue_ms: float,
+        api_keys: frozenset[str] = frozenset(),
+        trust_proxy_headers: bool = False,
+    ) -> None:
+        self.backend = backend
+        self.policies = policies
+        self.api_keys = api_keys
+        self.trust_proxy_headers = trust_proxy_headers
+        self.max_queue_s = max_queue_ms / 1000
+        self._slots = asyncio.Semaphore(max_concurrent_inference)
+        self.stats = {"admitted": 0, "rate_limited": 0, "shed": 0}
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        """Build a controller from ``RATE_LIMIT_*`` / ``MAX_*`` env vars."""
+        backend_name = os.getenv("RATE_LIMIT_BACKEND", "memory")
+        if backend_name != "memory":
+            raise ValueError(f"Unsupported RATE_LIMIT_BACKEND: {backend_name!r}")
+        return cls(
+            backend=InMemoryBackend(int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))),
+            policies={
+                INFERENCE: BucketPolicy(
+                    rate=float(os.getenv("RATE_LIMIT_INFERENCE_RPS", "5")),
+                    burst=int(os.getenv("RATE_LIMIT_INFERENCE_BURST", "20")),
+                ),
+                READ: BucketPolicy(
+                    rate=float(os.getenv("RATE_LIMIT_READ_RPS", "20")),
+                    burst=int(os.getenv("RATE_LIMIT_READ_BURST", "60")),
+                ),
+            },
+            max_concurrent_inference=int(os.getenv("MAX_CONCURRENT_INFERENCE", "4")),
+            max_queue_ms=float(os.getenv("MAX_QUEUE_MS", "250")),
+            api_keys=frozenset(
+                key.strip() for key in os.getenv("API_KEYS", "").split(",") if key.strip()
+            ),
+            trust_proxy_headers=os.getenv("TRUST_PROXY_HEADERS", "false").lower() == "true",
+        )
+
+    @staticmethod
+    def classify(method: str, path: str) -> str | None:
+        """Return the endpoint class for a request, or None if exempt."""
+        if method == "OPTIONS" or path.startswith(_EXEMPT_PATHS):
+            return None
+        if path.startswith(_INFERENCE_PREFIXES):
+            return INFERENCE
+        return READ
+
+    def client_key(self, headers, client_host: str | None) -> str:
+        """Identify the caller by API key, else IP.
+
+        Only keys listed in ``API_KEYS`` are honoured; any other value is
+        ignored and the caller is keyed by IP. X-Forwarded-For is only read
+        when ``trust_proxy_headers`` is set, i.e. the app is reachable solely
+        through our own proxy (Render); otherwise any client could spoof it.
+        The right-most entry is the one that proxy appended; entries to its
+        left are client-controlled.
+        """
+        api_key = headers.get("x-api-key")
+        if api_key and api_key in self.api_keys:
+            return f"key:{api_key}"
+        forwarded = headers.get("x-forwarded-for") if self.trust_proxy_headers else None
+        if forwarded:
+            return f"ip:{forwarded.split(',')[-1].strip()}"
+        return f"ip:{client_host or 'unknown'}"
+
+    def check_rate(self, endpoint_class: str, client: str) -> Decision:
+        """Consume one token from the client's bucket for this endpoint class."""
+        decision = self.backend.consume(
+            f"{endpoint_class}:{client}", self.policies[endpoint_class]
+        )
+        if not decision.allowed:
+            self.stats["rate_limited"] += 1
+        return decision
+
+    async def acquire_slot(self) -> bool:
+        """Wait up to ``max_queue_ms`` for an inference slot; False means shed.
+
+        ``asyncio.wait_for`` can report a timeout even though the acquire
+        already succeeded (fixed only in Python 3.12), leaking a permit. The
+        acquire runs as its own task instead, so after a timeout we can see
+        whether it won the race and keep the slot, or cancel it cleanly.
+        """
+        acquire = asyncio.ensure_future(self._slots.acquire())
+        try:
+            await asyncio.wait({acquire}, timeout=self.max_queue_s)
+        except asyncio.CancelledError:
+            acquire.cancel()
+            if acquire.done() and not acquire.cancelled():
+                self._slots.release()
+            raise
+        if not acquire.done():
+            acquire.cancel()
+            try:
+                await acquire
+            except asyncio.CancelledError:
+                self.stats["shed"] += 1
+                return False
+        return True
+
+    def release_slot(self) -> None:
+        self._slots.release()
+
+    @staticmethod
+    def headers(decision: Decision) -> dict[str, str]:
+        """Standard RateLimit-* (and Retry-After when rejected) headers."""
+        headers = {
+            "RateLimit-Limit": str(decision.limit),
+            "RateLimit-Remaining": str(decision.remaining),
+            "RateLimit-Reset": str(math.ceil(decision.reset_after)),
+        }
+        if not decision.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(decision.retry_after)))
+        return headers
@@ -0,0 +1,166 @@
+"""Columnar MessagePack batch protocol for high-volume internal callers.
+
+Request body (``Content-Type: application/msgpack``) is a map of column
+name to values. Numeric columns may be MessagePack arrays or, preferably,
+``bin`` payloads holding little-endian float64 values, which are wrapped
+with ``np.frombuffer`` without copying or creating per-row objects::
+
+    {
+        "location": ["Vashi", "Ulwe", ...],
+        "area_sqft": <bin: float64[n]>,
+        "bhk": <bin: float64[n]>,
+        ...
+        "parking": <bin: float64[n]>,   # optional, defaults to 1
+        "lift": <bin: float64[n]>,      # optional, defaults to 1
+    }
+
+Columns are validated in a vectorised way against the same bounds as
+``PredictionRequest``. The response is a map with ``count``,
+``model_version``, ``degraded`` (table estimate served past the deadline)
+and float64 ``bin`` columns ``predicted_price_inr`` and
+``price_per_sqft_inr``.
+"""
+
+from typing import Any
+
+import msgpack
+import numpy as np
+from annotated_types import Ge, Gt, Le, Lt
+
+from models.prediction import BHKType, PredictionRequest
+from services.locations import LocationIndex
+
+MEDIA_TYPE = "application/msgpack"
+MAX_ROWS = 100_000
+
+NUMERIC_COLUMNS = (
+    "area_sqft",
+    "bhk",
+    "bathrooms",
+    "floor",
+    "total_floors",
+    "age_of_property",
+    "parking",
+    "lift",
+)
+_OPTIONAL_DEFAULTS = {"parking": 1.0, "lift": 1.0}
+_INTEGER_COLUMNS = ("bhk", "floor", "total_floors", "parking", "lift")
+
+
+def _bounds() -> dict[str, list[tuple[str, float]]]:
+    """Collect numeric constraints from the PredictionRequest schema."""
+    bounds: dict[str, list[tuple[str, float]]] = {}
+    kinds = ((Gt, ">", "gt"), (Ge, ">=", "ge"), (Lt, "<", "lt"), (Le, "<=", "le"))
+    for name, field in PredictionRequest.model_fields.items():
+        for constraint in field.metadata:
+            for kind, op, attr in kinds:
+                if isinstance(constraint, kind):
+                    bounds.setdefault(name, []).append((op, getattr(constraint, attr)))
+    bounds["bhk"] = [(">=", min(BHKType)), ("<=", max(BHKType))]
+    bounds["parking"] = bounds["lift"] = [(">=", 0), ("<=", 1)]
+    return bounds
+
+
+_BOUNDS = _bounds()
+_OPS = {">": np.greater, ">=": np.greater_equal, "<": np.less, "<=": np.less_equal}
+
+
+class ColumnarError(ValueError):
+    """Raised when a columnar batch cannot be decoded or fails validation."""
+
+
+def _column(raw: Any, name: str, n_rows: int) -> np.ndarray:
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        if len(raw) != n_rows * 8:
+            raise ColumnarError(
+                f"Column '{name}' has {len(raw)} bytes; expected {n_rows} float64 values."
+            )
+        return np.frombuffer(raw, dtype="<f8")
+    try:
+        values = np.asarray(raw, dtype=np.float64)
+    except (TypeError, ValueError) as exc:
+        raise ColumnarError(f"Column '{name}' must be numeric.") from exc
+    if values.shape != (n_rows,):
+        raise ColumnarError(f"Column '{name}' has {values.size} values; expected {n_rows}.")
+    return values
+
+
+def decode_batch(body: bytes, locations: LocationIndex) -> dict[str, np.ndarray]:
+    """Decode and validate a columnar request body.
+
+    Args:
+        body: Raw MessagePack request body.
+        locations: Index used to resolve location names to canonical ones.
+
+    Returns:
+        Dict of column name -> 1-D array; ``location`` is an object array of
+        canonical location names.
+
+    Raises:
+        ColumnarError: On malformed payloads or out-of-range values.
+    """
+    try:
+        payload = msgpack.unpackb(body, raw=False)
+    except Exception as exc:
+        raise ColumnarError(f"Body is not valid MessagePack: {exc}") from exc
+    if not isinstance(payload, dict) or "location" not in payload:
+        raise ColumnarError("Body must be a map of columns including 'location'.")
+
+    raw_locations = payload["location"]
+    if not isinstance(raw_locations, list) or not all(
+        isinstance(value, str) for value in raw_locations
+    ):
+        raise ColumnarError("Column 'location' must be an array of strings.")
+    n_rows = len(raw_locations)
+    if not 1 <= n_rows <= MAX_ROWS:
+        raise ColumnarError(f"Batch must contain between 1 and {MAX_ROWS} rows.")
+
+    # Locations: map distinct values once, then index back.
+    uniques, inverse = np.unique(
+        np.asarray(raw_locations, dtype=object).astype(str), return_inverse=True
+    )
+    resolved = []
+    for value in uniques:
+        name = locations.resolve(value)
+        if name is None:
+            raise ColumnarError(locations.unknown_message(value))
+        resolved.append(name)
+    columns: dict[str, np.ndarray] = {
+        "location": np.asarray(resolved, dtype=object)[inverse]
+    }
+
+    for name in NUMERIC_COLUMNS:
+        if name not in payload:
+            if name in _OPTIONAL_DEFAULTS:
+                columns[name] = np.full(n_rows, _OPTIONAL_DEFAULTS[name])
+                continue
+            raise ColumnarError(f"Missing required column '{name}'.")
+        values = _column(payload[name], name, n_rows)
+        invalid = ~np.isfinite(values)
+        for op, limit in _BOUNDS.get(name, []):
+            invalid |= ~_OPS[op](values, limit)
+        if name in _INTEGER_COLUMNS:
+            invalid |= values != np.round(values)
+        if invalid.any():
+            row = int(np.argmax(invalid))
+            raise ColumnarError(
+                f"Invalid value {float(values[row])!r} in column '{name}' at row {row}."
+            )
+        columns[name] = values
+    return columns
+
+
+def encode_predictions(
+    prices: np.ndarray, area_sqft: np.ndarray, model_version: str, degraded: bool = False
+) -> bytes:
+    """Encode predictions as MessagePack with float64 ``bin`` columns."""
+    return msgpack.packb(
+        {
+            "count": int(prices.size),
+            "model_version": model_version,
+            "degraded": degraded,
+            "predicted_price_inr": prices.astype("<f8").tobytes(),
+            "price_per_sqft_inr": (prices / area_sqft).astype("<f8").tobytes(),
+        },
+        use_bin_type=True,
+    )
@@ -0,0 +1,202 @@
+"""Streaming feature drift monitoring against the training distribution.
+
+``ml/train.py`` stores a compact reference histogram per input feature (and
+the location mix) in ``metadata.json`` under ``reference_distributions``.
+Every served request is binned with the same cut points, which costs a
+binary search over ~10 cut points per feature. Live counts are halved
+whenever a feature's total exceeds ``DRIFT_WINDOW`` so memory stays fixed
+and recent traffic dominates.
+
+Scores per feature:
+
+* PSI - population stability index over the bins (0.1 = moderate,
+  0.25 = significant shift).
+* KS - maximum distance between the binned reference and live CDFs.
+* ``out_of_range`` - share of live values outside the training min/max,
+  e.g. towers taller than any in the training data.
+"""
+
+import logging
+import os
+from bisect import bisect_right
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Training column -> request field
+FEATURE_FIELDS = {
+    "Area_sqft": "area_sqft",
+    "BHK": "bhk",
+    "Bathrooms": "bathrooms",
+    "Floor": "floor",
+    "Total_Floors": "total_floors",
+    "Age_of_Property": "age_of_property",
+    "Parking": "parking",
+    "Lift": "lift",
+}
+
+OTHER_LOCATION = "__other__"
+_EPSILON = 1e-4
+_MIN_SAMPLES = 30
+
+
+def bin_index(value: float, cuts: list[float], low: float, high: float) -> int:
+    """Map a value to its histogram bin (must match ml/train.py).
+
+    Bin 0 holds values below the training minimum and the last bin values
+    above the training maximum; the bins in between are split at ``cuts``.
+    """
+    if value < low:
+        return 0
+    if value > high:
+        return len(cuts) + 2
+    return bisect_right(cuts, value) + 1
+
+
+def psi(reference: np.ndarray, live: np.ndarray) -> float:
+    """Population stability index between two proportion vectors."""
+    p = np.clip(live, _EPSILON, None)
+    q = np.clip(reference, _EPSILON, None)
+    return float(np.sum((p - q) * np.log(p / q)))
+
+
+def ks(reference: np.ndarray, live: np.ndarray) -> float:
+    """Kolmogorov-Smirnov distance between binned distributions."""
+    return float(np.max(np.abs(np.cumsum(reference) - np.cumsum(live))))
+
+
+def _status(score: float) -> str:
+    if score >= 0.25:
+        return "significant"
+    if score >= 0.1:
+        return "moderate"
+    return "stable"
+
+
+class DriftMonitor:
+    """Singleton holding fixed-size live histograms for each feature."""
+
+    _reference: dict[str, Any] = {}
+    _counts: dict[str, np.ndarray] = {}
+    _location_index: dict[str, int] = {}
+    _location_counts: np.ndarray = np.zeros(0)
+    _total: float = 0.0  # running sum of _location_counts
+    _window: int = 10_000
+
+    @classmethod
+    def configure(cls, metadata: dict[str, Any]) -> None:
+        """Load reference histograms from model metadata and reset live counts."""
+        cls._reference = metadata.get("reference_distributions", {})
+        if not cls._reference:
+            logger.warning("No reference distributions in metadata; drift monitoring off.")
+            return
+        cls._window = int(os.getenv("DRIFT_WINDOW", "10000"))
+        cls._counts = {
+            name: np.zeros(len(ref["proportions"]))
+            for name, ref in cls._reference["numeric"].items()
+        }
+        locations = list(cls._reference["location"]) + [OTHER_LOCATION]
+        cls._location_index = {loc.lower(): i for i, loc in enumerate(locations)}
+        cls._location_counts = np.zeros(len(locations))
+        cls._total = 0.0
+        logger.info("Drift monitor tracking %d features.", len(cls._counts))
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return bool(cls._reference)
+
+    @classmethod
+    def observe(cls, rows: list[dict[str, Any]]) -> None:
+        """Add served request rows to the live histograms."""
+        if not cls._reference:
+            return
+        numeric = cls._reference["numeric"]
+        for row in rows:
+            for name, ref in numeric.items():
+                value = float(row[FEATURE_FIELDS[name]])
+                cls._counts[name][
+                    bin_index(value, ref["cuts"], ref["min"], ref["max"])
+                ] += 1
+            index = cls._location_index.get(
+                row["location"].lower(), len(cls._location_index) - 1
+            )
+            cls._location_counts[index] += 1
+        cls._total += len(rows)
+        cls._forget()
+
+    @classmethod
+    def observe_columns(cls, columns: dict[str, np.ndarray]) -> None:
+        """Vectorised ``observe`` for columnar batches."""
+        if not cls._reference:
+            return
+        for name, ref in cls._reference["numeric"].items():
+            values = columns[FEATURE_FIELDS[name]]
+            bins = np.searchsorted(ref["cuts"], values, side="right") + 1
+            bins[values < ref["min"]] = 0
+            bins[values > ref["max"]] = len(ref["cuts"]) + 2
+            cls._counts[name] += np.bincount(bins, minlength=len(cls._counts[name]))
+        other = len(cls._location_index) - 1
+        locations, counts = np.unique(columns["location"].astype(str), return_counts=True)
+        for location, count in zip(locations, counts):
+            cls._location_counts[cls._location_index.get(location.lower(), other)] += count
+        cls._total += float(counts.sum())
+        cls._forget()
+
+    @classmethod
+    def _forget(cls) -> None:
+        """Exponential forgetting keeps the counts bounded and recent.
+
+        Checks the running total rather than summing the location counts,
+        so the per-request cost does not grow with the number of locations.
+        """
+        while cls._total > cls._window:
+            cls._total /= 2
+            cls._location_counts /= 2
+            for counts in cls._counts.values():
+                counts /= 2
+
+    @classmethod
+    def report(cls) -> dict[str, Any]:
+        """Return per-feature PSI / KS scores and the location mix shift."""
+        if not cls._reference:
+            return {"enabled": False}
+        samples = cls._total
+        result: dict[str, Any] = {
+            "enabled": True,
+            "effective_samples": round(samples, 1),
+            "reference_samples": cls._reference.get("samples", 0),
+        }
+        if samples < _MIN_SAMPLES:
+            result["status"] = "insufficient_data"
+            return result
+
+        features = {}
+        for name, ref in cls._reference["numeric"].items():
+            reference = np.asarray(ref["proportions"])
+            live = cls._counts[name] / cls._counts[name].sum()
+            score = psi(reference, live)
+            features[FEATURE_FIELDS[name]] = {
+                "psi": round(score, 4),
+                "ks": round(ks(reference, live), 4),
+                "out_of_range": round(float(live[0] + live[-1]), 4),
+                "status": _status(score),
+            }
+
+        ref_mix = np.asarray(list(cls._reference["location"].values()) + [0.0])
+        live_mix = cls._location_counts / samples
+        names = list(cls._reference["location"]) + [OTHER_LOCATION]
+        location_psi = psi(ref_mix, live_mix)
+        result["features"] = features
+        result["location"] = {
+            "psi": round(location_psi, 4),
+            "status": _status(location_psi),
+            "shift": {
+                name: round(float(live - ref), 4)
+                for name, live, ref in zip(names, live_mix, ref_mix)
+            },
+        }
+        worst = max([f["psi"] for f in features.values()] + [location_psi])
+        result["status"] = _status(worst)
+        return result
@@ -0,0 +1,182 @@
+"""Request deadlines and the degraded price estimate served when they pass.
+
+Prediction endpoints run the model off the event loop and wait at most
+the request deadline: ``X-Deadline-Ms`` from the caller (capped at
+``PREDICT_DEADLINE_MAX_MS``), else ``PREDICT_DEADLINE_MS``. If the model
+has not answered by then (slow reload, GC pause, saturated worker), the
+response is ``area_sqft x median price per sqft`` from a table built by
+``ml/train.py``, using the most specific level available: location + BHK,
+then location, then all training data. Such responses are flagged
+``degraded`` and counted in :attr:`FallbackEstimator.stats`.
+
+Model calls run on :class:`ModelCallExecutor`, a dedicated pool of
+``PREDICT_MODEL_THREADS`` threads. A model call cannot be interrupted, so
+one that misses its deadline keeps its thread until it finishes and its
+result is discarded. To stop abandoned calls from piling up behind a slow
+model, at most ``PREDICT_MODEL_THREADS + PREDICT_MODEL_QUEUE`` calls may be
+in flight (running, queued or abandoned); past that, requests go straight
+to the fallback without touching the pool. A queued call whose deadline
+has already passed when a thread picks it up is skipped.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def request_deadline_s(header_ms: int | None) -> float | None:
+    """Effective deadline in seconds, or None when deadlines are disabled."""
+    max_ms = float(os.getenv("PREDICT_DEADLINE_MAX_MS", "5000"))
+    if header_ms is not None:
+        return min(header_ms, max_ms) / 1000
+    default_ms = float(os.getenv("PREDICT_DEADLINE_MS", "1000"))
+    return default_ms / 1000 if default_ms > 0 else None
+
+
+class FallbackEstimator:
+    """Singleton lookup of training-time price-per-sqft medians."""
+
+    _table: dict[str, Any] = {}
+    stats: dict[str, int] = {
+        "model": 0,
+        "deadline_exceeded": 0,
+        "fallback": 0,
+        "fallback_unavailable": 0,
+        "saturated": 0,
+        "skipped": 0,
+    }
+
+    @classmethod
+    def configure(cls, metadata: dict[str, Any]) -> None:
+        """Load the fallback table from model metadata."""
+        cls._table = metadata.get("fallback_price_per_sqft", {})
+        if not cls._table:
+            logger.warning(
+                "No fallback_price_per_sqft in metadata; requests past their "
+                "deadline will wait for the model."
+            )
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return bool(cls._table)
+
+    @classmethod
+    def estimate(cls, row: dict[str, Any]) -> tuple[float, str]:
+        """Return ``(price_inr, basis)`` for a request row.
+
+        ``basis`` names the table level used: ``location_bhk``,
+        ``location`` or ``overall``.
+        """
+        location, bhk = row["location"], str(int(row["bhk"]))
+        rate = cls._table["by_location_bhk"].get(location, {}).get(bhk)
+        basis = "location_bhk"
+        if rate is None:
+            rate, basis = cls._table["by_location"].get(location), "location"
+        if rate is None:
+            rate, basis = cls._table["overall"], "overall"
+        return rate * row["area_sqft"], basis
+
+    @classmethod
+    def estimate_columns(
+        cls, location: np.ndarray, bhk: np.ndarray, area_sqft: np.ndarray
+    ) -> np.ndarray:
+        """Vectorised :meth:`estimate` prices for a columnar batch."""
+        location_codes, location_names = pd.factorize(location)
+        pairs, inverse = np.unique(
+            np.stack([location_codes, bhk.astype(np.intp)], axis=1),
+            axis=0,
+            return_inverse=True,
+        )
+        rates = np.array(
+            [
+                cls.estimate({"location": location_names[code], "bhk": b, "area_sqft": 1.0})[0]
+                for code, b in pairs
+            ]
+        )
+        return rates[inverse.ravel()] * area_sqft
+
+
+class DeadlineExpired(Exception):
+    """A queued model call was skipped because its deadline had passed."""
+
+
+class ModelCallExecutor:
+    """Singleton bounded thread pool for deadline-guarded model calls."""
+
+    _executor: ThreadPoolExecutor | None = None
+    _max_in_flight: int = 0
+    _in_flight: int = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def start(cls) -> None:
+        """Create the pool from ``PREDICT_MODEL_*`` env vars."""
+        threads = max(1, int(os.getenv("PREDICT_MODEL_THREADS", "2")))
+        cls._max_in_flight = threads + max(0, int(os.getenv("PREDICT_MODEL_QUEUE", "2")))
+        cls._executor = ThreadPoolExecutor(threads, thread_name_prefix="predict")
+        logger.info(
+            "Model call pool: %d threads, at most %d calls in flight.",
+            threads,
+            cls._max_in_flight,
+        )
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the pool without waiting for abandoned calls."""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+
+    @classmethod
+    def in_flight(cls) -> int:
+        return cls._in_flight
+
+    @classmethod
+    def submit(
+        cls, fn: Callable[..., Any], *args: Any, deadline: float | None = None
+    ) -> Future | None:
+        """Run ``fn(*args)`` on the pool.
+
+        Args:
+            fn: The model call.
+            *args: Positional arguments for ``fn``.
+            deadline: ``time.monotonic()`` value after which the call is no
+                longer wanted. Calls with a deadline may be abandoned, so
+                they are refused (None is returned) when the pool is at its
+                in-flight limit, and skipped with :class:`DeadlineExpired`
+                if they only start after it. Calls without one are always
+                queued, since the caller waits for them.
+
+        Returns:
+            A ``concurrent.futures.Future``, or None if refused.
+        """
+        if cls._executor is None:
+            cls.start()
+        with cls._lock:
+            if deadline is not None and cls._in_flight >= cls._max_in_flight:
+                FallbackEstimator.stats["saturated"] += 1
+                return None
+            cls._in_flight += 1
+        future = cls._executor.submit(cls._run, fn, args, deadline)
+        future.add_done_callback(cls._release)
+        return future
+
+    @classmethod
+    def _run(cls, fn: Callable[..., Any], args: tuple, deadline: float | None) -> Any:
+        if deadline is not None and time.monotonic() >= deadline:
+            FallbackEstimator.stats["skipped"] += 1
+            raise DeadlineExpired()
+        return fn(*args)
+
+    @classmethod
+    def _release(cls, _future: Future) -> None:
+        with cls._lock:
+            cls._in_flight -= 1
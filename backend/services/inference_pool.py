@@ -0,0 +1,158 @@
+"""Process-pool inference backend for large batches.
+
+sklearn tree ensembles hold the GIL for much of ``predict``, so a single
+API process scores a big batch on one core regardless of thread count.
+``InferencePool`` keeps worker processes that each load the pipeline once
+(in the pool initializer) and scores a batch by splitting it into one
+contiguous shard per worker.
+
+Shards are not pickled: the parent writes the numeric feature matrix
+(location as an integer code column) into a ``SharedMemory`` block, and
+each task carries only the block names, its row range and the location
+categories. Workers write predictions into a shared output block at their
+row offsets, so results come back in input order without copying.
+
+``predict`` blocks until every shard is scored, so it must run on a worker
+thread (the API reaches it through ``ModelCallExecutor``); calling it on
+the event loop thread raises instead of freezing the process.
+"""
+
+import asyncio
+import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_worker_pipeline = None
+
+
+def _init_worker(model_path: str) -> None:
+    global _worker_pipeline
+    _worker_pipeline = joblib.load(model_path)
+
+
+def _ping() -> bool:
+    return _worker_pipeline is not None
+
+
+def _score_shard(
+    in_name: str,
+    out_name: str,
+    n_rows: int,
+    start: int,
+    stop: int,
+    numeric_columns: list[str],
+    locations: list[str],
+) -> None:
+    """Score rows ``[start, stop)`` of the shared input into the shared output."""
+    # Workers share the parent's resource tracker, so attaching here does not
+    # add a second owner; the parent unlinks both blocks.
+    in_block = shared_memory.SharedMemory(name=in_name)
+    out_block = shared_memory.SharedMemory(name=out_name)
+    matrix = frame = out = None
+    try:
+        matrix = np.ndarray(
+            (n_rows, len(numeric_columns) + 1), dtype=np.float64, buffer=in_block.buf
+        )[start:stop]
+        frame = pd.DataFrame(matrix[:, :-1], columns=numeric_columns)
+        frame["Location"] = np.asarray(locations, dtype=object)[matrix[:, -1].astype(np.intp)]
+        out = np.ndarray((n_rows,), dtype=np.float64, buffer=out_block.buf)
+        out[start:stop] = _worker_pipeline.predict(frame)
+    finally:
+        del matrix, frame, out  # release buffer exports before closing
+        in_block.close()
+        out_block.close()
+
+
+class InferencePool:
+    """Worker processes that each hold a copy of the pipeline."""
+
+    def __init__(self, model_path: Path, workers: int, min_rows: int) -> None:
+        self.workers = workers
+        self.min_rows = min_rows
+        # forkserver: never fork the multi-threaded API process itself.
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp.get_context("forkserver"),
+            initializer=_init_worker,
+            initargs=(str(model_path),),
+        )
+        # Each submit spawns a worker while none is idle, so this starts them all
+        # and loads the model before the first request needs it.
+        futures = [self._executor.submit(_ping) for _ in range(workers)]
+        if not all(f.result() for f in futures):
+            raise RuntimeError("Inference workers failed to load the model.")
+        logger.info("Inference pool ready: %d workers, min batch %d rows.", workers, min_rows)
+
+    def accepts(self, n_rows: int) -> bool:
+        """Whether a batch is large enough to be worth sharding."""
+        return n_rows >= self.min_rows
+
+    def predict(self, frame: pd.DataFrame) -> np.ndarray:
+        """Score a pipeline input frame across the workers, preserving row order.
+
+        Raises:
+            RuntimeError: If called from a thread running an event loop.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "InferencePool.predict blocks until all shards finish; "
+                "call it from a worker thread, not the event loop."
+            )
+        n_rows = len(frame)
+        numeric_columns = [c for c in frame.columns if c != "Location"]
+        codes, locations = pd.factorize(frame["Location"])
+
+        in_block = shared_memory.SharedMemory(
+            create=True, size=n_rows * (len(numeric_columns) + 1) * 8
+        )
+        out_block = shared_memory.SharedMemory(create=True, size=n_rows * 8)
+        matrix = out = None
+        try:
+            matrix = np.ndarray(
+                (n_rows, len(numeric_columns) + 1), dtype=np.float64, buffer=in_block.buf
+            )
+            matrix[:, :-1] = frame[numeric_columns].to_numpy(dtype=np.float64)
+            matrix[:, -1] = codes
+
+            bounds = np.linspace(0, n_rows, self.workers + 1, dtype=int)
+            futures = [
+                self._executor.submit(
+                    _score_shard,
+                    in_block.name,
+                    out_block.name,
+                    n_rows,
+                    int(start),
+                    int(stop),
+                    numeric_columns,
+                    list(locations),
+                )
+                for start, stop in zip(bounds[:-1], bounds[1:])
+                if stop > start
+            ]
+            wait(futures)
+            for future in futures:
+                future.result()  # re-raise worker errors
+            out = np.ndarray((n_rows,), dtype=np.float64, buffer=out_block.buf)
+            predictions = out.copy()
+        finally:
+            del matrix, out
+            in_block.close()
+            in_block.unlink()
+            out_block.close()
+            out_block.unlink()
+        return predictions
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,213 @@
+"""Live pricing sessions over a WebSocket.
+
+The predictor form streams partial feature updates while the user drags
+sliders. Each connection keeps the merged feature state on the server;
+updates only mark it dirty. A scorer task waits until the client has been
+quiet for ``debounce_ms`` (or ``max_wait_ms`` has passed since the first
+pending update, so a continuous drag still refreshes) and scores the
+latest state once, however many updates arrived in between.
+
+Client -> server::
+
+    {"seq": 7, "features": {"area_sqft": 1150}}
+
+Server -> client::
+
+    {"type": "prediction", "seq": 7, "prediction": {...PredictionResponse}}
+    {"type": "error", "seq": 7, "detail": ...}
+
+``seq`` is echoed from the newest update included in the result so the
+client can ignore stale responses. Outgoing messages go through a bounded
+queue; when a slow client lets it fill up, the oldest queued message is
+dropped, since only the newest price matters.
+
+Sessions are capped globally (``LIVE_MAX_SESSIONS``) and per client key
+(``LIVE_MAX_SESSIONS_PER_CLIENT``) so one caller cannot hold every slot.
+The score function is awaited, so it can offload inference and apply the
+same deadline as the HTTP endpoints.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+logger = logging.getLogger(__name__)
+
+ScoreFn = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+class LiveSession:
+    """One WebSocket connection: receive, debounce-and-score, send."""
+
+    stats: dict[str, int] = {
+        "active_sessions": 0,
+        "sessions": 0,
+        "updates": 0,
+        "scored": 0,
+        "coalesced": 0,
+        "dropped": 0,
+    }
+    _per_client: dict[str, int] = {}
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        client: str,
+        score: ScoreFn,
+        allowed_fields: set[str],
+        debounce_ms: float,
+        max_wait_ms: float,
+        send_queue_size: int,
+    ) -> None:
+        self.websocket = websocket
+        self.client = client
+        self.score = score
+        self.allowed_fields = allowed_fields
+        self.debounce_s = debounce_ms / 1000
+        self.max_wait_s = max_wait_ms / 1000
+        self._state: dict[str, Any] = {}
+        self._seq = 0
+        self._pending_updates = 0
+        self._dirty = asyncio.Event()
+        self._outbox: asyncio.Queue[dict[str, Any]] = asyncio.Queue(send_queue_size)
+
+    @classmethod
+    def from_env(
+        cls,
+        websocket: WebSocket,
+        client: str,
+        score: ScoreFn,
+        allowed_fields: set[str],
+    ) -> "LiveSession":
+        """Build a session configured from ``LIVE_*`` env vars."""
+        return cls(
+            websocket,
+            client,
+            score,
+            allowed_fields,
+            debounce_ms=float(os.getenv("LIVE_DEBOUNCE_MS", "120")),
+            max_wait_ms=float(os.getenv("LIVE_MAX_WAIT_MS", "400")),
+            send_queue_size=int(os.getenv("LIVE_SEND_QUEUE", "4")),
+        )
+
+    @staticmethod
+    def max_sessions() -> int:
+        return int(os.getenv("LIVE_MAX_SESSIONS", "200"))
+
+    @staticmethod
+    def max_sessions_per_client() -> int:
+        return int(os.getenv("LIVE_MAX_SESSIONS_PER_CLIENT", "5"))
+
+    @classmethod
+    def reserve(cls, client: str) -> bool:
+        """Claim a session slot for ``client``; False if a cap is reached.
+
+        A successful reservation is released when :meth:`run` finishes, or
+        by calling :meth:`release` if the session never runs.
+        """
+        held = cls._per_client.get(client, 0)
+        if (
+            cls.stats["active_sessions"] >= cls.max_sessions()
+            or held >= cls.max_sessions_per_client()
+        ):
+            return False
+        cls._per_client[client] = held + 1
+        cls.stats["active_sessions"] += 1
+        cls.stats["sessions"] += 1
+        return True
+
+    @classmethod
+    def release(cls, client: str) -> None:
+        """Return a slot claimed with :meth:`reserve`."""
+        cls.stats["active_sessions"] -= 1
+        held = cls._per_client.pop(client, 1) - 1
+        if held:
+            cls._per_client[client] = held
+
+    async def run(self) -> None:
+        """Serve the connection until the client disconnects.
+
+        The caller must have reserved a slot for ``self.client``.
+        """
+        tasks = [
+            asyncio.create_task(self._receive()),
+            asyncio.create_task(self._score_latest()),
+            asyncio.create_task(self._send()),
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                exc = task.exception()
+                if exc is not None and not isinstance(exc, WebSocketDisconnect):
+                    logger.error("Live pricing session failed: %s", exc, exc_info=exc)
+        finally:
+            type(self).release(self.client)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _enqueue(self, message: dict[str, Any]) -> None:
+        """Queue an outgoing message, evicting the oldest one if full."""
+        if self._outbox.full():
+            self._outbox.get_nowait()
+            type(self).stats["dropped"] += 1
+        self._outbox.put_nowait(message)
+
+    async def _receive(self) -> None:
+        while True:
+            try:
+                message = json.loads(await self.websocket.receive_text())
+            except json.JSONDecodeError:
+                self._enqueue({"type": "error", "seq": None, "detail": "Invalid JSON."})
+                continue
+            seq = message.get("seq") if isinstance(message, dict) else None
+            features = message.get("features") if isinstance(message, dict) else None
+            if not isinstance(features, dict):
+                self._enqueue(
+                    {"type": "error", "seq": seq, "detail": "Expected {'seq', 'features'}."}
+                )
+                continue
+            unknown = sorted(set(features) - self.allowed_fields)
+            if unknown:
+                self._enqueue(
+                    {"type": "error", "seq": seq, "detail": f"Unknown fields: {unknown}"}
+                )
+                continue
+
+            self._state.update(features)
+            self._seq = seq if isinstance(seq, int) else self._seq + 1
+            self._pending_updates += 1
+            type(self).stats["updates"] += 1
+            self._dirty.set()
+
+    async def _score_latest(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._dirty.wait()
+            first_update = loop.time()
+            # Trailing debounce, capped at max_wait since the first pending update.
+            while True:
+                self._dirty.clear()
+                timeout = min(self.debounce_s, first_update + self.max_wait_s - loop.time())
+                if timeout <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._dirty.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+            state, seq = dict(self._state), self._seq
+            self._dirty.clear()
+            type(self).stats["coalesced"] += self._pending_updates - 1
+            type(self).stats["scored"] += 1
+            self._pending_updates = 0
+            self._enqueue({"seq": seq, **await self.score(state)})
+
+    async def _send(self) -> None:
+        while True:
+            message = await self._outbox.get()
+            await self.websocket.send_json(message)
@@ -0,0 +1,148 @@
+"""Location name resolution for request validation.
+
+Known locations (and any ``location_aliases`` from ``metadata.json``) are
+indexed by a normalized key: lowercase alphanumerics only, so
+``"cbd-belapur "`` and ``"CBD Belapur"`` hit the same dict entry. An exact
+lookup is one hash of the input regardless of how many locations the model
+knows.
+
+Misspellings within one edit are resolved through a deletion index (the
+SymSpell approach): every key is also stored under each of its
+single-character deletions, so the candidates for an input are found with
+``len(input) + 1`` dict lookups rather than a scan over all locations.
+Sharing a deletion variant only bounds the distance by two (``"lwex"`` and
+``"ulwe"`` both reduce to ``"lwe"``), so each candidate is then checked for
+a true Damerau-Levenshtein distance of at most one.
+
+A fuzzy match is only accepted when it is unambiguous and leaves the
+numbered parts of the name alone: ``"Sector 16"`` is one edit from
+``"Sector 15"`` (and ``"Sector 5B"`` from ``"Sector 5A"``) but names a
+different place. Every word containing a digit must match exactly; other
+one-edit candidates are offered as suggestions in the error message and
+never resolved automatically.
+"""
+
+import re
+from typing import Iterable
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_WORDS = re.compile(r"[0-9a-z]+")
+_MIN_FUZZY_LENGTH = 4
+_MAX_LISTED = 20
+
+
+def _numbered_words(name: str) -> tuple[str, ...]:
+    """Words of ``name`` that contain a digit, e.g. ``("5a",)`` for "Sector 5A"."""
+    return tuple(w for w in _WORDS.findall(name.lower()) if not w.isalpha())
+
+
+def _deletions(key: str) -> set[str]:
+    return {key[:i] + key[i + 1 :] for i in range(len(key))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True if one insertion, deletion, substitution or adjacent swap turns a into b."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) < len(b):
+        return a[i:] == b[i + 1 :]
+    return (
+        a[i + 1 :] == b[i + 1 :]
+        or (a[i : i + 2] == b[i : i + 2][::-1] and a[i + 2 :] == b[i + 2 :])
+    )
+
+
+class LocationIndex:
+    """Hashed lookup of canonical location names with typo tolerance."""
+
+    def __init__(
+        self, locations: Iterable[str], aliases: dict[str, str] | None = None
+    ) -> None:
+        self.names = sorted(locations)
+        self._exact: dict[str, str] = {}
+        # Key -> words containing digits, only for keys that have any.
+        self._numbered: dict[str, tuple[str, ...]] = {}
+        for alias, name in [*(aliases or {}).items(), *((n, n) for n in self.names)]:
+            key = self.normalize(alias)
+            self._exact[key] = name
+            numbered = _numbered_words(alias)
+            if numbered:
+                self._numbered[key] = numbered
+            else:
+                self._numbered.pop(key, None)
+
+        # Deletion variant -> normalized key, or a tuple of keys when variants
+        # collide (a plain str per entry keeps the index small for large
+        # vocabularies). Keys map back to names through ``_exact``.
+        self._deleted: dict[str, str | tuple[str, ...]] = {}
+        for key in self._exact:
+            if len(key) >= _MIN_FUZZY_LENGTH:
+                for variant in _deletions(key):
+                    found = self._deleted.get(variant)
+                    if found is None:
+                        self._deleted[variant] = key
+                    elif isinstance(found, str):
+                        self._deleted[variant] = (found, key)
+                    else:
+                        self._deleted[variant] = (*found, key)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        return _NON_ALNUM.sub("", name.lower())
+
+    def candidates(self, name: str) -> list[str]:
+        """Canonical names within one insertion, deletion, substitution or swap."""
+        return sorted({self._exact[k] for k in self._candidate_keys(self.normalize(name))})
+
+    def _candidate_keys(self, key: str) -> set[str]:
+        """Indexed keys within one edit of the normalized ``key``."""
+        if len(key) < _MIN_FUZZY_LENGTH:
+            return set()
+        keys: set[str] = set()
+        for variant in (key, *_deletions(key)):
+            if variant in self._exact:
+                keys.add(variant)
+            match = self._deleted.get(variant)
+            if isinstance(match, str):
+                keys.add(match)
+            elif match:
+                keys.update(match)
+        return {k for k in keys if _within_one_edit(key, k)}
+
+    def resolve(self, name: str) -> str | None:
+        """Return the canonical location for ``name``, or None if unknown.
+
+        With an empty index (no metadata) every name is accepted as given. A
+        typo is corrected only if exactly one location matches and the edit
+        does not touch a digit.
+        """
+        if not self.names:
+            return name
+        key = self.normalize(name)
+        canonical = self._exact.get(key)
+        if canonical is not None:
+            return canonical
+        numbered = _numbered_words(name)
+        candidates = {
+            self._exact[k]
+            for k in self._candidate_keys(key)
+            if self._numbered.get(k, ()) == numbered
+        }
+        return candidates.pop() if len(candidates) == 1 else None
+
+    def unknown_message(self, name: str) -> str:
+        """Error text for an unresolvable name, with suggestions when possible."""
+        candidates = self.candidates(name)
+        if candidates:
+            return f"Unknown location: '{name}'. Did you mean one of: {candidates}?"
+        if len(self.names) <= _MAX_LISTED:
+            return f"Unknown location: '{name}'. Valid locations: {self.names}"
+        return f"Unknown location: '{name}'. See /api/v1/metadata for valid locations."
@@ -6,6 +6,8 @@ Thread-safe for use with async FastAPI workers.
 
 import json
 import logging
+import os
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Any
 
@@ -13,6 +15,11 @@ import joblib
 import numpy as np
 import pandas as pd
 
+from services.explainer import TreeShapExplainer
+from services.fallback import FallbackEstimator
+from services.inference_pool import InferencePool
+from services.locations import LocationIndex
+
 logger = logging.getLogger(__name__)
 
 _MODEL_PATH = Path(__file__).resolve().parent.parent / "model.pkl"
@@ -24,6 +31,9 @@ class ModelService:
 
     _pipeline = None
     _metadata: dict[str, Any] = {}
+    _explainer: TreeShapExplainer | None = None
+    _pool: InferencePool | None = None
+    _locations: LocationIndex = LocationIndex([])
 
     @classmethod
     def load(cls) -> None:
@@ -49,15 +59,51 @@ class ModelService:
                 len(cls._metadata.get("locations", [])),
                 cls._metadata.get("cv_r2_mean", 0),
             )
+        cls._locations = LocationIndex(
+            cls._metadata.get("locations", []), cls._metadata.get("location_aliases")
+        )
+
+        try:
+            cls._explainer = TreeShapExplainer.from_pipeline(cls._pipeline)
+        except TypeError as exc:
+            logger.warning("Per-prediction explanations disabled: %s", exc)
+
+        workers = int(os.getenv("INFERENCE_WORKERS", "0"))
+        if workers > 0:
+            cls._pool = InferencePool(
+                _MODEL_PATH,
+                workers=workers,
+                min_rows=int(os.getenv("INFERENCE_POOL_MIN_ROWS", "20000")),
+            )
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the inference worker processes, if any."""
+        if cls._pool is not None:
+            cls._pool.shutdown()
+            cls._pool = None
 
     @classmethod
     def is_loaded(cls) -> bool:
         return cls._pipeline is not None
 
+    @classmethod
+    def can_explain(cls) -> bool:
+        return cls._explainer is not None
+
+    @staticmethod
+    def max_explain_rows() -> int:
+        """Largest batch that may request explanations, which cost far more than predicting."""
+        return int(os.getenv("EXPLAIN_MAX_ROWS", "250"))
+
     @classmethod
     def get_metadata(cls) -> dict[str, Any]:
         return cls._metadata
 
+    @classmethod
+    def location_index(cls) -> LocationIndex:
+        return cls._locations
+
     @classmethod
     def predict(
         cls,
@@ -70,6 +116,7 @@ class ModelService:
         age_of_property: float,
         parking: bool,
         lift: bool,
+        explain: bool = False,
     ) -> dict[str, Any]:
         """Run inference and return structured prediction results.
 
@@ -83,6 +130,7 @@ class ModelService:
             age_of_property: Age in years.
             parking: Parking availability.
             lift: Lift availability.
+            explain: Attach per-feature SHAP attributions to the result.
 
         Returns:
             Dict with predicted price and derived metrics.
@@ -90,38 +138,152 @@ class ModelService:
         Raises:
             RuntimeError: If model has not been loaded.
         """
+        return cls.predict_batch(
+            [
+                {
+                    "location": location,
+                    "area_sqft": area_sqft,
+                    "bhk": bhk,
+                    "bathrooms": bathrooms,
+                    "floor": floor,
+                    "total_floors": total_floors,
+                    "age_of_property": age_of_property,
+                    "parking": parking,
+                    "lift": lift,
+                }
+            ],
+            explain=explain,
+        )[0]
+
+    @classmethod
+    def predict_batch(
+        cls, rows: list[dict[str, Any]], explain: bool = False
+    ) -> list[dict[str, Any]]:
+        """Run vectorised inference over many properties at once.
+
+        Args:
+            rows: Dicts with the same keys as the ``predict`` arguments.
+            explain: Attach per-feature SHAP attributions to each result.
+
+        Returns:
+            One result dict per input row, in order.
+
+        Raises:
+            RuntimeError: If model has not been loaded, or explanations were
+                requested for a model that does not support them.
+        """
         if cls._pipeline is None:
             raise RuntimeError("Model not loaded. Call ModelService.load() first.")
+        if explain and cls._explainer is None:
+            raise RuntimeError("Explanations are not available for this model.")
 
-        # --- Derived features (must match training script) ---
-        floor_ratio = floor / max(total_floors, 1)
-        bhk_density = bhk / (area_sqft / 100)
+        features = cls._build_features(rows)
+        predictions = cls._predict_frame(features)
+        results = [
+            cls._format_prediction(float(price), row["area_sqft"])
+            for price, row in zip(predictions, rows)
+        ]
+        if explain:
+            for result, explanation in zip(results, cls._explainer.explain(features)):
+                result["explanation"] = explanation
+        return results
 
-        # --- Build feature DataFrame ---
-        features = pd.DataFrame(
-            [
-                {
-                    "Area_sqft": area_sqft,
-                    "BHK": bhk,
-                    "Bathrooms": bathrooms,
-                    "Floor": floor,
-                    "Total_Floors": total_floors,
-                    "Age_of_Property": age_of_property,
-                    "Parking": int(parking),
-                    "Lift": int(lift),
-                    "Floor_Ratio": floor_ratio,
-                    "BHK_Density": bhk_density,
-                    "Location": location,
-                }
-            ]
+    @classmethod
+    def predict_columns(cls, columns: dict[str, np.ndarray]) -> np.ndarray:
+        """Score a validated columnar batch without per-row Python objects.
+
+        Args:
+            columns: 1-D arrays keyed by request field name.
+
+        Returns:
+            Predicted prices in INR (clamped like ``predict``).
+
+        Raises:
+            RuntimeError: If model has not been loaded.
+        """
+        if cls._pipeline is None:
+            raise RuntimeError("Model not loaded. Call ModelService.load() first.")
+        predictions = cls._predict_frame(cls._frame_from_columns(columns))
+        return np.maximum(predictions, 500_000)
+
+    @classmethod
+    def _predict_frame(cls, features: pd.DataFrame) -> np.ndarray:
+        """Score in the worker pool when the batch is large enough, else in-process.
+
+        Blocking; callers on the event loop go through ``ModelCallExecutor``.
+        """
+        if cls._pool is not None and cls._pool.accepts(len(features)):
+            try:
+                return cls._pool.predict(features)
+            except BrokenProcessPool as exc:
+                logger.error("Inference pool broken, scoring in-process from now on: %s", exc)
+                cls._pool = None
+        return cls._pipeline.predict(features)
+
+    @classmethod
+    def _build_features(cls, rows: list[dict[str, Any]]) -> pd.DataFrame:
+        """Build the pipeline input frame from request rows."""
+        return cls._frame_from_columns(
+            {key: np.asarray([row[key] for row in rows]) for key in rows[0]}
+        )
+
+    @staticmethod
+    def _frame_from_columns(columns: dict[str, np.ndarray]) -> pd.DataFrame:
+        """Build the pipeline input frame, including derived features."""
+        area_sqft = columns["area_sqft"]
+        floor = columns["floor"]
+        bhk = columns["bhk"]
+        return pd.DataFrame(
+            {
+                "Area_sqft": area_sqft,
+                "BHK": bhk,
+                "Bathrooms": columns["bathrooms"],
+                "Floor": floor,
+                "Total_Floors": columns["total_floors"],
+                "Age_of_Property": columns["age_of_property"],
+                "Parking": columns["parking"].astype(int),
+                "Lift": columns["lift"].astype(int),
+                # Derived features (must match training script)
+                "Floor_Ratio": floor / np.maximum(columns["total_floors"], 1),
+                "BHK_Density": bhk / (area_sqft / 100),
+                "Location": columns["location"],
+            }
+        )
+
+    @classmethod
+    def fallback_prediction(cls, row: dict[str, Any]) -> dict[str, Any]:
+        """Degraded estimate from the training-time price-per-sqft table.
+
+        Args:
+            row: Dict with the same keys as the ``predict`` arguments.
+
+        Returns:
+            Result dict like ``predict``, flagged ``degraded`` with the table
+            level used in ``fallback_basis``.
+        """
+        price, basis = FallbackEstimator.estimate(row)
+        # Wider band: the table ignores floor, age and amenities.
+        result = cls._format_prediction(price, row["area_sqft"], confidence_margin=0.30)
+        result.update(degraded=True, fallback_basis=basis)
+        return result
+
+    @staticmethod
+    def fallback_columns(columns: dict[str, np.ndarray]) -> np.ndarray:
+        """Degraded table prices for a columnar batch (clamped like ``predict_columns``)."""
+        prices = FallbackEstimator.estimate_columns(
+            columns["location"], columns["bhk"], columns["area_sqft"]
         )
+        return np.maximum(prices, 500_000)
 
-        predicted_price = float(cls._pipeline.predict(features)[0])
+    @staticmethod
+    def _format_prediction(
+        predicted_price: float, area_sqft: float, confidence_margin: float = 0.15
+    ) -> dict[str, Any]:
+        """Convert a raw model output into the API result structure."""
         # Clamp to realistic range
         predicted_price = max(predicted_price, 500_000)
 
         price_per_sqft = predicted_price / area_sqft
-        confidence_margin = 0.15  # ±15%
 
         return {
             "predicted_price_inr": round(predicted_price, 2),
@@ -0,0 +1,230 @@
+"""Non-blocking audit log of served predictions.
+
+Request handlers call :meth:`PredictionLog.record`, which only appends to a
+bounded in-memory ring buffer. A background task drains the buffer in
+batches and writes them to a local SQLite database off the event loop. When
+the buffer is full new records are dropped and counted instead of blocking
+the request. The database file is rotated once it exceeds a size limit, and
+the buffer is drained on application shutdown: the flusher is told to stop
+and awaited rather than cancelled, so a batch already handed to the writer
+thread is always committed and counted.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from collections import deque
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_DIR = Path(__file__).resolve().parent.parent / "prediction_logs"
+
+_COLUMNS = (
+    "ts",
+    "endpoint",
+    "model_version",
+    "latency_ms",
+    "location",
+    "area_sqft",
+    "bhk",
+    "bathrooms",
+    "floor",
+    "total_floors",
+    "age_of_property",
+    "parking",
+    "lift",
+    "predicted_price_inr",
+)
+
+_CREATE_TABLE = f"""
+CREATE TABLE IF NOT EXISTS predictions (
+    ts REAL NOT NULL,
+    endpoint TEXT NOT NULL,
+    model_version TEXT,
+    latency_ms REAL,
+    location TEXT,
+    area_sqft REAL,
+    bhk INTEGER,
+    bathrooms REAL,
+    floor INTEGER,
+    total_floors INTEGER,
+    age_of_property REAL,
+    parking INTEGER,
+    lift INTEGER,
+    predicted_price_inr REAL
+)
+"""
+_INSERT = (
+    f"INSERT INTO predictions ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)})"
+)
+
+
+class PredictionLog:
+    """Singleton ring buffer + background SQLite writer."""
+
+    _buffer: deque = deque()
+    _capacity: int = 10_000
+    _batch_size: int = 500
+    _flush_interval_s: float = 2.0
+    _max_bytes: int = 50 * 1024 * 1024
+    _keep_files: int = 10
+    _directory: Path = _DEFAULT_DIR
+    _task: asyncio.Task | None = None
+    _wakeup: asyncio.Event | None = None
+    _stopping: bool = False
+    _enabled: bool = False
+    stats: dict[str, int] = {"recorded": 0, "written": 0, "dropped": 0, "rotations": 0}
+
+    @classmethod
+    async def start(cls) -> None:
+        """Configure from env vars and start the background flusher."""
+        if os.getenv("PREDICTION_LOG_ENABLED", "true").lower() != "true":
+            logger.info("Prediction log disabled.")
+            return
+        cls._capacity = int(os.getenv("PREDICTION_LOG_BUFFER", "10000"))
+        cls._batch_size = int(os.getenv("PREDICTION_LOG_BATCH", "500"))
+        cls._flush_interval_s = float(os.getenv("PREDICTION_LOG_FLUSH_S", "2"))
+        cls._max_bytes = int(os.getenv("PREDICTION_LOG_MAX_MB", "50")) * 1024 * 1024
+        cls._keep_files = int(os.getenv("PREDICTION_LOG_KEEP_FILES", "10"))
+        cls._directory = Path(os.getenv("PREDICTION_LOG_DIR", str(_DEFAULT_DIR)))
+        cls._directory.mkdir(parents=True, exist_ok=True)
+
+        cls._buffer = deque()
+        cls._wakeup = asyncio.Event()
+        cls._stopping = False
+        cls._enabled = True
+        cls._task = asyncio.create_task(cls._run(), name="prediction-log-flusher")
+        logger.info("Prediction log writing to %s", cls._directory)
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Stop the flusher and write out everything still buffered.
+
+        The flusher finishes its current write, drains the buffer and exits
+        on its own; cancelling it could abandon a batch mid ``to_thread``.
+        """
+        if not cls._enabled:
+            return
+        cls._enabled = False
+        cls._stopping = True
+        cls._wakeup.set()
+        if cls._task is not None:
+            await cls._task
+            cls._task = None
+        logger.info("Prediction log flushed: %s", cls.stats)
+
+    @classmethod
+    def record(
+        cls,
+        endpoint: str,
+        inputs: dict[str, Any],
+        predicted_price_inr: float,
+        model_version: str,
+        latency_ms: float,
+    ) -> None:
+        """Queue one served prediction. Never blocks; drops when the buffer is full."""
+        if not cls._enabled:
+            return
+        if len(cls._buffer) >= cls._capacity:
+            cls.stats["dropped"] += 1
+            return
+        cls._buffer.append(
+            (
+                time.time(),
+                endpoint,
+                model_version,
+                latency_ms,
+                inputs["location"],
+                inputs["area_sqft"],
+                int(inputs["bhk"]),
+                inputs["bathrooms"],
+                inputs["floor"],
+                inputs["total_floors"],
+                inputs["age_of_property"],
+                int(inputs["parking"]),
+                int(inputs["lift"]),
+                predicted_price_inr,
+            )
+        )
+        cls.stats["recorded"] += 1
+        if len(cls._buffer) >= cls._batch_size:
+            cls._wakeup.set()
+
+    @classmethod
+    def record_columns(
+        cls,
+        endpoint: str,
+        columns: dict[str, Any],
+        predicted_price_inr: Any,
+        model_version: str,
+        latency_ms: float,
+    ) -> None:
+        """Queue a columnar batch; rows beyond the free buffer space are dropped."""
+        if not cls._enabled:
+            return
+        n_rows = len(predicted_price_inr)
+        accepted = max(0, min(n_rows, cls._capacity - len(cls._buffer)))
+        cls.stats["dropped"] += n_rows - accepted
+        if not accepted:
+            return
+        now = time.time()
+        fields = [columns[name][:accepted].tolist() for name in _COLUMNS[4:-1]]
+        cls._buffer.extend(
+            (now, endpoint, model_version, latency_ms, *values)
+            for values in zip(*fields, predicted_price_inr[:accepted].tolist())
+        )
+        cls.stats["recorded"] += accepted
+        if len(cls._buffer) >= cls._batch_size:
+            cls._wakeup.set()
+
+    @classmethod
+    async def _run(cls) -> None:
+        while not cls._stopping:
+            try:
+                await asyncio.wait_for(cls._wakeup.wait(), timeout=cls._flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            cls._wakeup.clear()
+            while cls._buffer:
+                await cls._flush()
+
+    @classmethod
+    async def _flush(cls) -> None:
+        batch = [cls._buffer.popleft() for _ in range(min(cls._batch_size, len(cls._buffer)))]
+        try:
+            await asyncio.to_thread(cls._write, batch)
+        except Exception as exc:  # never let logging take the API down
+            cls.stats["dropped"] += len(batch)
+            logger.error("Prediction log write failed: %s", exc, exc_info=True)
+            return
+        cls.stats["written"] += len(batch)
+
+    @classmethod
+    def _write(cls, batch: list[tuple]) -> None:
+        path = cls._directory / "predictions.sqlite"
+        if path.exists() and path.stat().st_size >= cls._max_bytes:
+            cls._rotate(path)
+        # The connection's own context manager only commits; closing() also
+        # releases the file handle instead of leaving it to the GC.
+        with closing(sqlite3.connect(path)) as conn, conn:
+            conn.execute(_CREATE_TABLE)
+            conn.executemany(_INSERT, batch)
+
+    @classmethod
+    def _rotate(cls, path: Path) -> None:
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        # Counter suffix so two rotations within one second never collide.
+        seq = 0
+        while (target := path.with_name(f"predictions-{stamp}-{seq:03d}.sqlite")).exists():
+            seq += 1
+        path.rename(target)
+        cls.stats["rotations"] += 1
+        rotated = sorted(cls._directory.glob("predictions-*.sqlite"))
+        for stale in rotated[: max(len(rotated) - cls._keep_files, 0)]:
+            stale.unlink()
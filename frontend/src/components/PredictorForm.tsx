@@ -1,7 +1,14 @@
 "use client";
 
-import { useState, useEffect } from "react";
-import { getMetadata, predictPrice, type PredictionResponse } from "@/lib/api";
+import { useState, useEffect, useRef } from "react";
+import {
+    getMetadata,
+    openLivePricing,
+    predictPrice,
+    type LivePricingSession,
+    type PredictionRequest,
+    type PredictionResponse,
+} from "@/lib/api";
 
 export default function PredictorForm() {
     const [locations, setLocations] = useState<string[]>([]);
@@ -9,6 +16,7 @@ export default function PredictorForm() {
     const [predicting, setPredicting] = useState(false);
     const [result, setResult] = useState<PredictionResponse | null>(null);
     const [error, setError] = useState<string | null>(null);
+    const liveRef = useRef<LivePricingSession | null>(null);
 
     const [formData, setFormData] = useState({
         location: "",
@@ -54,6 +62,29 @@ export default function PredictorForm() {
         loadMeta();
     }, []);
 
+    // Live pricing: stream field changes once the form is populated.
+    useEffect(() => {
+        if (loading) return;
+        const session = openLivePricing((message) => {
+            // Errors here are usually half-typed values; keep the last valid price.
+            if (message.type === "prediction" && message.prediction) {
+                setResult(message.prediction);
+            }
+        });
+        session.update(formData);
+        liveRef.current = session;
+        return () => {
+            session.close();
+            liveRef.current = null;
+        };
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, [loading]);
+
+    const updateField = <K extends keyof PredictionRequest>(name: K, value: PredictionRequest[K]) => {
+        setFormData(prev => ({ ...prev, [name]: value }));
+        liveRef.current?.update({ [name]: value } as Partial<PredictionRequest>);
+    };
+
     const handleSubmit = async (e: React.FormEvent) => {
         e.preventDefault();
         setPredicting(true);
@@ -110,7 +141,7 @@ export default function PredictorForm() {
                                     <select
                                         className="w-full bg-white/5 border border-white/10 rounded-2xl px-5 py-4 text-sm text-white focus:outline-none focus:border-gold-500/50 transition-all cursor-pointer hover:bg-white/[0.08]"
                                         value={(formData as any)[field.name]}
-                                        onChange={(e) => setFormData({ ...formData, [field.name]: field.name === 'location' ? e.target.value : Number(e.target.value) })}
+                                        onChange={(e) => updateField(field.name as keyof PredictionRequest, field.name === 'location' ? e.target.value : Number(e.target.value))}
                                     >
                                         {field.options?.map(opt => (
                                             <option key={opt} value={opt} className="bg-black">{opt} {field.name === 'bhk' ? 'BHK' : ''}</option>
@@ -122,7 +153,7 @@ export default function PredictorForm() {
                                         step={field.step || "1"}
                                         className="w-full bg-white/5 border border-white/10 rounded-2xl px-5 py-4 text-sm text-white focus:outline-none focus:border-gold-500/50 transition-all hover:bg-white/[0.08]"
                                         value={(formData as any)[field.name]}
-                                        onChange={(e) => setFormData({ ...formData, [field.name]: Number(e.target.value) })}
+                                        onChange={(e) => updateField(field.name as keyof PredictionRequest, Number(e.target.value))}
                                     />
                                 )}
                             </div>
@@ -135,7 +166,7 @@ export default function PredictorForm() {
                                 type="checkbox"
                                 className="w-5 h-5 rounded border-white/10 bg-white/5 text-gold-600 focus:ring-gold-500 transition-all"
                                 checked={formData.parking}
-                                onChange={(e) => setFormData({ ...formData, parking: e.target.checked })}
+                                onChange={(e) => updateField("parking", e.target.checked)}
                             />
                             <span className="text-[11px] font-bold text-gray-400 group-hover:text-gold-500/80 transition-colors uppercase tracking-widest">Reserved Parking</span>
                         </label>
@@ -144,7 +175,7 @@ export default function PredictorForm() {
                                 type="checkbox"
                                 className="w-5 h-5 rounded border-white/10 bg-white/5 text-gold-600 focus:ring-gold-500 transition-all"
                                 checked={formData.lift}
-                                onChange={(e) => setFormData({ ...formData, lift: e.target.checked })}
+                                onChange={(e) => updateField("lift", e.target.checked)}
                             />
                             <span className="text-[11px] font-bold text-gray-400 group-hover:text-gold-500/80 transition-colors uppercase tracking-widest">Private Lift</span>
                         </label>
@@ -201,7 +232,7 @@ export default function PredictorForm() {
                             </div>
                             <div>
                                 <p className="text-[9px] uppercase text-gray-500 font-black tracking-widest mb-1">Model Precision</p>
-                                <p className="text-base sm:text-lg font-bold text-gold-500 italic">High Confidence</p>
+                                <p className="text-base sm:text-lg font-bold text-gold-500 italic">{result.degraded ? "Quick Estimate" : "High Confidence"}</p>
                             </div>
                         </div>
 
@@ -30,6 +30,12 @@ export interface PredictionResponse {
     location: string;
     area_sqft: number;
     bhk: number;
+    explanation?: {
+        base_value_inr: number;
+        contributions_inr: Record<string, number>;
+    };
+    degraded: boolean;
+    fallback_basis?: "location_bhk" | "location" | "overall";
 }
 
 export interface MetadataResponse {
@@ -79,6 +85,58 @@ export async function predictPrice(data: PredictionRequest): Promise<PredictionR
     return res.json();
 }
 
+export interface LivePricingMessage {
+    type: "prediction" | "error";
+    seq: number | null;
+    prediction?: PredictionResponse;
+    detail?: unknown;
+}
+
+export interface LivePricingSession {
+    update(features: Partial<PredictionRequest>): void;
+    close(): void;
+}
+
+/**
+ * Open a live pricing WebSocket. Partial updates are debounced and coalesced
+ * server-side; only the price for the latest state is pushed back.
+ */
+export function openLivePricing(
+    onMessage: (message: LivePricingMessage) => void,
+): LivePricingSession {
+    const socket = new WebSocket(`${API_BASE_URL.replace(/^http/, "ws")}/api/v1/predict/live`);
+    let seq = 0;
+    let lastDelivered = 0;
+    let pending: Partial<PredictionRequest> = {};
+
+    socket.onopen = () => {
+        if (Object.keys(pending).length > 0) {
+            socket.send(JSON.stringify({ seq, features: pending }));
+            pending = {};
+        }
+    };
+    socket.onmessage = (event) => {
+        const message: LivePricingMessage = JSON.parse(event.data);
+        if (message.seq !== null && message.seq < lastDelivered) return; // stale
+        lastDelivered = message.seq ?? lastDelivered;
+        onMessage(message);
+    };
+
+    return {
+        update(features) {
+            seq += 1;
+            if (socket.readyState === WebSocket.OPEN) {
+                socket.send(JSON.stringify({ seq, features }));
+            } else {
+                pending = { ...pending, ...features };
+            }
+        },
+        close() {
+            socket.close();
+        },
+    };
+}
+
 /**
  * Fetch market stats for the dashboard.
  */
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Location-encoding benchmark: cost as the number of locations grows.
+
+Builds synthetic datasets from the cleaned listings by resampling rows and
+assigning each one of ``n`` synthetic locations with its own price level
+(log-normal multiplier). For every location count and encoding
+(``onehot`` / ``target``) the production GBR pipeline is fitted in a fresh
+worker process and the script records: fit time, how far fitting raised
+peak RSS, width and size of the transformed feature matrix, median
+single-row and batch predict latency, serialized artifact size and test R².
+
+Usage:
+    python ml/benchmark_locations.py
+    python ml/benchmark_locations.py --locations 10 100 1000 5000 --rows 20000
+
+Output:
+    backend/artifacts/location_benchmark.json - Comparison table
+"""
+
+import argparse
+import json
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import r2_score
+from sklearn.model_selection import train_test_split
+
+from compaction import artifact_size, measure_latency
+from train import (
+    ALL_FEATURES,
+    ARTIFACTS_DIR,
+    LOCATION_ENCODINGS,
+    TARGET,
+    build_model,
+    build_pipeline,
+    load_features,
+)
+
+REPORT_PATH = ARTIFACTS_DIR / "location_benchmark.json"
+
+
+def synthetic_dataset(base: pd.DataFrame, n_locations: int, n_rows: int) -> pd.DataFrame:
+    """Resample listings and spread them over ``n_locations`` priced locations."""
+    rng = np.random.default_rng(n_locations)
+    df = base.sample(n_rows, replace=True, random_state=n_locations).reset_index(drop=True)
+    names = np.array([f"Sector {i:05d}" for i in range(n_locations)], dtype=object)
+    level = rng.lognormal(mean=0.0, sigma=0.35, size=n_locations)
+    codes = rng.integers(0, n_locations, n_rows)
+    df["Location"] = names[codes]
+    df[TARGET] = df[TARGET] * level[codes]
+    return df
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def _run_case(df: pd.DataFrame, encoding: str, n_estimators: int) -> dict:
+    """Fit and measure one (dataset, encoding) case in a fresh worker."""
+    X_train, X_test, y_train, y_test = train_test_split(
+        df[ALL_FEATURES], df[TARGET].values, test_size=0.2, random_state=42
+    )
+    pipeline = build_pipeline(
+        build_model().set_params(n_estimators=n_estimators), encoding
+    )
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    pipeline.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    fit_rss_mb = _peak_rss_mb() - baseline
+
+    transformed = pipeline.named_steps["preprocessor"].transform(X_test.iloc[:1])
+    row = {
+        "locations": int(df["Location"].nunique()),
+        "encoding": encoding,
+        "fit_seconds": round(fit_seconds, 3),
+        "fit_rss_mb": round(fit_rss_mb, 1),
+        "n_features": int(transformed.shape[1]),
+        "train_matrix_mb": round(len(X_train) * transformed.shape[1] * 8 / 2**20, 1),
+        "size_bytes": artifact_size(pipeline),
+        "test_r2": round(float(r2_score(y_test, pipeline.predict(X_test))), 4),
+    }
+    row.update(measure_latency(pipeline, X_test))
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--locations", type=int, nargs="+", default=[10, 100, 1000],
+        help="Location counts to benchmark",
+    )
+    parser.add_argument("--rows", type=int, default=10_000, help="Rows per dataset")
+    parser.add_argument(
+        "--n-estimators", type=int, default=100,
+        help="Boosting stages per fit (fewer than production to keep runs short)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the cleaned-feature cache"
+    )
+    args = parser.parse_args()
+
+    base = load_features(not args.no_cache)
+    results = []
+    header = (
+        f"{'locations':>9s} {'encoding':>8s} {'R2':>7s} {'fit s':>7s} {'fit RSS MB':>11s} "
+        f"{'features':>9s} {'matrix MB':>10s} {'row ms':>8s} {'batch ms':>9s} {'size KB':>9s}"
+    )
+    print(f"\n{header}\n{'-' * len(header)}")
+    # One case at a time, each in a fresh process, so timings and RSS are clean.
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        for n_locations in args.locations:
+            df = synthetic_dataset(base, n_locations, args.rows)
+            for encoding in LOCATION_ENCODINGS:
+                r = pool.submit(_run_case, df, encoding, args.n_estimators).result()
+                results.append(r)
+                print(
+                    f"{r['locations']:9d} {encoding:>8s} {r['test_r2']:7.4f} "
+                    f"{r['fit_seconds']:7.2f} {r['fit_rss_mb']:11.1f} {r['n_features']:9d} "
+                    f"{r['train_matrix_mb']:10.1f} {r['single_row_ms']:8.3f} "
+                    f"{r['batch_ms']:9.3f} {r['size_bytes'] / 1024:9.1f}"
+                )
+
+    ARTIFACTS_DIR.mkdir(exist_ok=True)
+    with open(REPORT_PATH, "w") as f:
+        json.dump(
+            {"rows": args.rows, "n_estimators": args.n_estimators, "results": results},
+            f,
+            indent=2,
+        )
+    print(f"\nLocation benchmark report saved to: {REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
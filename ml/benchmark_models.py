@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""Model-family benchmark: accuracy vs training and inference cost.
+
+Trains several candidate regressors on the same cleaned train/test split
+used by ``train.py`` (one worker process per candidate, at most one per
+core so fits do not time-slice each other) and records, for each: fit
+time, peak RSS of the fitting process and how much fitting added to it,
+median single-row and full-batch predict latency (measured serially, so
+candidates do not compete for CPU), serialized artifact size, 5-fold
+cross-validated R² on the training split and test metrics.
+
+With a latency budget, the shipped model is chosen by cross-validated R²;
+the test split only reports, so the exported test metrics are unbiased.
+
+Usage:
+    python ml/benchmark_models.py
+    python ml/benchmark_models.py --latency-budget-ms 3
+    python ml/benchmark_models.py --latency-budget-ms 3 --export backend/model.pkl
+
+Output:
+    backend/artifacts/model_benchmark.json - Comparison table
+"""
+
+import argparse
+import json
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import cross_val_score
+
+from compaction import artifact_size, measure_latency
+from train import (
+    ARTIFACTS_DIR,
+    METADATA_PATH,
+    MODEL_PATH,
+    build_model,
+    build_pipeline,
+    evaluate,
+    load_features,
+    next_model_version,
+    split_dataset,
+    top_feature_importances,
+)
+
+REPORT_PATH = ARTIFACTS_DIR / "model_benchmark.json"
+
+CANDIDATES = {
+    "GradientBoostingRegressor": build_model,
+    "RandomForestRegressor": lambda: RandomForestRegressor(
+        n_estimators=300, min_samples_leaf=2, n_jobs=1, random_state=42
+    ),
+    "HistGradientBoostingRegressor": lambda: HistGradientBoostingRegressor(
+        max_iter=300, learning_rate=0.08, max_depth=5, min_samples_leaf=3,
+        random_state=42,
+    ),
+    "Ridge": lambda: Ridge(alpha=1.0),
+}
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def _fit_candidate(name: str, X_train, y_train):
+    """Fit one candidate in a fresh worker.
+
+    Returns:
+        ``(name, pipeline, fit_seconds, peak_rss_mb, fit_rss_mb, cv_scores)``
+        where ``fit_rss_mb`` is how far fitting raised the worker's peak RSS
+        and ``cv_scores`` are 5-fold R² scores on the training split
+        (computed after the timed fit).
+    """
+    pipeline = build_pipeline(CANDIDATES[name]())
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    pipeline.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    peak = _peak_rss_mb()
+    cv_scores = cross_val_score(pipeline, X_train, y_train, cv=5, scoring="r2")
+    return name, pipeline, fit_seconds, peak, peak - baseline, cv_scores
+
+
+def benchmark(jobs: int | None = None, use_cache: bool = True) -> list[dict]:
+    """Fit every candidate in parallel, then measure each one serially."""
+    X_train, X_test, y_train, y_test = split_dataset(load_features(use_cache))
+    print(f"\nTrain: {X_train.shape[0]} | Test: {X_test.shape[0]}")
+    print(f"Fitting {len(CANDIDATES)} model families in parallel...")
+
+    # More workers than cores would just time-slice the fits and inflate fit_seconds.
+    workers = jobs or min(len(CANDIDATES), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = [
+            pool.submit(_fit_candidate, name, X_train, y_train) for name in CANDIDATES
+        ]
+        fitted = [f.result() for f in futures]
+
+    results = []
+    for name, pipeline, fit_seconds, peak_rss_mb, fit_rss_mb, cv_scores in fitted:
+        preds = pipeline.predict(X_test)
+        row = {
+            "model": name,
+            "fit_seconds": round(fit_seconds, 3),
+            "peak_rss_mb": round(peak_rss_mb, 1),
+            "fit_rss_mb": round(fit_rss_mb, 1),
+            "size_bytes": artifact_size(pipeline),
+            "cv_r2_mean": round(float(cv_scores.mean()), 4),
+            "cv_r2_std": round(float(cv_scores.std()), 4),
+            "test_r2": round(float(r2_score(y_test, preds)), 4),
+            "test_mae": round(float(mean_absolute_error(y_test, preds)), 2),
+            "test_rmse": round(float(np.sqrt(mean_squared_error(y_test, preds))), 2),
+        }
+        row.update(measure_latency(pipeline, X_test))
+        row["pipeline"] = pipeline
+        results.append(row)
+    return results
+
+
+def select(results: list[dict], latency_budget_ms: float) -> dict | None:
+    """Best cross-validated model whose single-row latency fits the budget."""
+    eligible = [r for r in results if r["single_row_ms"] <= latency_budget_ms]
+    return max(eligible, key=lambda r: r["cv_r2_mean"]) if eligible else None
+
+
+def print_table(results: list[dict], selected: dict | None) -> None:
+    header = (
+        f"{'model':30s} {'CV R2':>7s} {'test R2':>7s} {'MAE (INR)':>12s} {'fit s':>7s} "
+        f"{'row ms':>8s} {'batch ms':>9s} {'size KB':>9s} {'fit RSS MB':>11s}"
+    )
+    print(f"\n{header}\n{'-' * len(header)}")
+    for r in results:
+        marker = " *" if r is selected else ""
+        print(
+            f"{r['model']:30s} {r['cv_r2_mean']:7.4f} {r['test_r2']:7.4f} {r['test_mae']:12,.0f} "
+            f"{r['fit_seconds']:7.2f} {r['single_row_ms']:8.3f} {r['batch_ms']:9.3f} "
+            f"{r['size_bytes'] / 1024:9.1f} {r['fit_rss_mb']:11.1f}{marker}"
+        )
+
+
+def export(selected: dict, path: Path, use_cache: bool = True) -> None:
+    """Write the selected pipeline; refresh served metadata if it replaces model.pkl.
+
+    Every model-dependent metadata field is replaced with the selected
+    pipeline's (train/test metrics, cross-validation, feature importances)
+    and the model gets a new version, so nothing describing the previous
+    GBR survives the swap.
+    """
+    pipeline = selected["pipeline"]
+    joblib.dump(pipeline, path)
+    print(f"Selected model saved to: {path}")
+    if path.resolve() != MODEL_PATH.resolve() or not METADATA_PATH.exists():
+        return
+    with open(METADATA_PATH) as f:
+        metadata = json.load(f)
+
+    X_train, _, y_train, _ = split_dataset(load_features(use_cache))
+    train_metrics = evaluate(y_train, pipeline.predict(X_train), "Train")
+
+    metadata["model_version"] = next_model_version("minor")
+    metadata["algorithm"] = selected["model"]
+    metadata["train_metrics"] = {k: round(v, 2) for k, v in train_metrics.items()}
+    metadata["test_metrics"] = {
+        "mae": round(selected["test_mae"], 2),
+        "rmse": round(selected["test_rmse"], 2),
+        "r2": round(selected["test_r2"], 2),
+    }
+    metadata["cv_r2_mean"] = selected["cv_r2_mean"]
+    metadata["cv_r2_std"] = selected["cv_r2_std"]
+    top_features = top_feature_importances(pipeline)
+    if top_features is not None:
+        metadata["top_features"] = top_features
+    else:
+        metadata.pop("top_features", None)
+    metadata.pop("compaction", None)
+    with open(METADATA_PATH, "w") as f:
+        json.dump(metadata, f, indent=2)
+    print(f"Metadata updated: {METADATA_PATH}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--latency-budget-ms",
+        type=float,
+        default=None,
+        help="Pick the best cross-validated model with median single-row latency under this",
+    )
+    parser.add_argument(
+        "--export",
+        type=Path,
+        default=None,
+        help="Write the selected model to this path (requires --latency-budget-ms)",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=None,
+        help="Parallel fit workers (default: one per core, at most one per candidate)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the cleaned-feature cache"
+    )
+    args = parser.parse_args()
+    if args.export and args.latency_budget_ms is None:
+        parser.error("--export requires --latency-budget-ms")
+
+    results = benchmark(args.jobs, use_cache=not args.no_cache)
+    selected = (
+        select(results, args.latency_budget_ms)
+        if args.latency_budget_ms is not None
+        else None
+    )
+    print_table(results, selected)
+
+    ARTIFACTS_DIR.mkdir(exist_ok=True)
+    with open(REPORT_PATH, "w") as f:
+        json.dump(
+            {
+                "latency_budget_ms": args.latency_budget_ms,
+                "selected": selected["model"] if selected else None,
+                "results": [
+                    {k: v for k, v in r.items() if k != "pipeline"} for r in results
+                ],
+            },
+            f,
+            indent=2,
+        )
+    print(f"\nBenchmark report saved to: {REPORT_PATH}")
+
+    if args.latency_budget_ms is not None:
+        if selected is None:
+            print(f"No model meets the {args.latency_budget_ms} ms latency budget.")
+            return
+        print(f"Selected under {args.latency_budget_ms} ms: {selected['model']}")
+        if args.export:
+            export(selected, args.export, use_cache=not args.no_cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""Post-training compaction of the GradientBoosting pipeline.
+
+Evaluates three size/latency reductions, alone and combined:
+
+* **Ensemble truncation** - keep only the first ``k`` boosting stages. The
+  accuracy curve for every ``k`` comes from a single ``staged_predict`` pass.
+* **Depth pruning** - collapse every node below a depth cap into a leaf whose
+  value is the cover-weighted mean of the leaves it replaces. Trees are
+  rebuilt with only the reachable nodes, so the artifact actually shrinks.
+* **float32 thresholds and leaves** - thresholds are rounded *down* to the
+  float32 grid (predictions are unchanged, since sklearn compares float32
+  inputs) and leaf values rounded to float32, which leaves zeroed low
+  mantissa bits for compression to exploit.
+
+Every variant, the original included, is sized and exported with the same
+joblib compression level, so size differences come from the model alone.
+
+Variants are *selected* on a validation slice held out from the training
+split: a clone of the pipeline is refitted without that slice, and each
+variant of the clone is scored on it. The test split is only used to report
+R², MAE, size and latency of the same variants of the shipped model, so the
+reported test metrics are not biased by the choice. The smallest variant
+whose validation R² is within ``max_r2_loss`` of the original can be
+exported.
+"""
+
+import copy
+import io
+import time
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.tree._tree import TREE_LEAF, TREE_UNDEFINED, Tree
+
+TRUNCATION_GRID = (50, 100, 150, 200, 250)
+DEPTH_GRID = (4, 3)
+COMPRESS_LEVEL = 3
+
+
+# ---------------------------------------------------------------------------
+# Tree surgery
+# ---------------------------------------------------------------------------
+
+def _rebuild_tree(tree: Tree, max_depth: int | None, quantize: bool) -> Tree:
+    """Return a copy of ``tree`` pruned to ``max_depth`` and/or quantized."""
+    state = tree.__getstate__()
+    nodes, values = state["nodes"], state["values"]
+
+    # Cover-weighted subtree means, computed bottom-up (children follow parents).
+    means = values[:, 0, 0].copy()
+    cover = nodes["weighted_n_node_samples"]
+    for node in range(len(nodes) - 1, -1, -1):
+        left, right = nodes["left_child"][node], nodes["right_child"][node]
+        if left != TREE_LEAF:
+            means[node] = (
+                means[left] * cover[left] + means[right] * cover[right]
+            ) / cover[node]
+
+    kept_nodes, kept_values = [], []
+    depth_reached = 0
+    # Breadth-first copy of reachable nodes; (old_id, depth, parent_slot, is_left)
+    queue = [(0, 0, -1, False)]
+    while queue:
+        old, depth, parent, is_left = queue.pop(0)
+        new = len(kept_nodes)
+        record = nodes[old].copy()
+        value = values[old].copy()
+        if parent >= 0:
+            kept_nodes[parent]["left_child" if is_left else "right_child"] = new
+        is_split = record["left_child"] != TREE_LEAF
+        if is_split and max_depth is not None and depth >= max_depth:
+            record["left_child"] = record["right_child"] = TREE_LEAF
+            record["feature"] = TREE_UNDEFINED
+            record["threshold"] = TREE_UNDEFINED
+            value[0, 0] = means[old]
+            is_split = False
+        if is_split:
+            if quantize:
+                t32 = np.float32(record["threshold"])
+                if t32 > record["threshold"]:
+                    t32 = np.nextafter(t32, np.float32(-np.inf))
+                record["threshold"] = t32
+            queue.append((int(nodes["left_child"][old]), depth + 1, new, True))
+            queue.append((int(nodes["right_child"][old]), depth + 1, new, False))
+        if quantize:
+            value = value.astype(np.float32).astype(np.float64)
+        kept_nodes.append(record)
+        kept_values.append(value)
+        depth_reached = max(depth_reached, depth)
+
+    rebuilt = Tree(tree.n_features, np.asarray(tree.n_classes), tree.n_outputs)
+    rebuilt.__setstate__(
+        {
+            "max_depth": depth_reached,
+            "node_count": len(kept_nodes),
+            "nodes": np.array(kept_nodes, dtype=nodes.dtype),
+            "values": np.array(kept_values, dtype=values.dtype),
+        }
+    )
+    return rebuilt
+
+
+def make_variant(
+    pipeline: Pipeline,
+    n_estimators: int | None = None,
+    max_depth: int | None = None,
+    quantize: bool = False,
+) -> Pipeline:
+    """Return a compacted deep copy of ``pipeline``."""
+    variant = copy.deepcopy(pipeline)
+    gbr = variant.named_steps["model"]
+    if n_estimators is not None and n_estimators < gbr.n_estimators_:
+        gbr.estimators_ = gbr.estimators_[:n_estimators]
+        gbr.train_score_ = gbr.train_score_[:n_estimators]
+        gbr.n_estimators = gbr.n_estimators_ = n_estimators
+        if hasattr(gbr, "oob_improvement_"):
+            gbr.oob_improvement_ = gbr.oob_improvement_[:n_estimators]
+            gbr.oob_scores_ = gbr.oob_scores_[:n_estimators]
+            gbr.oob_score_ = gbr.oob_scores_[-1]
+    if max_depth is not None or quantize:
+        for estimator in gbr.estimators_[:, 0]:
+            estimator.tree_ = _rebuild_tree(estimator.tree_, max_depth, quantize)
+        if max_depth is not None:
+            gbr.max_depth = min(gbr.max_depth, max_depth)
+    return variant
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def artifact_size(pipeline: Pipeline, compress: int = 0) -> int:
+    """Serialized size of ``pipeline`` in bytes."""
+    buffer = io.BytesIO()
+    joblib.dump(pipeline, buffer, compress=compress)
+    return buffer.tell()
+
+
+def measure_latency(
+    pipeline: Pipeline, X: pd.DataFrame, repeats: int = 100
+) -> dict[str, float]:
+    """Median single-row latency and full-batch latency, in milliseconds."""
+    rows = [X.iloc[[i % len(X)]] for i in range(repeats)]
+    pipeline.predict(rows[0])  # warm up
+    timings = []
+    for row in rows:
+        start = time.perf_counter()
+        pipeline.predict(row)
+        timings.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    pipeline.predict(X)
+    batch = time.perf_counter() - start
+    return {
+        "single_row_ms": round(float(np.median(timings)) * 1000, 3),
+        "batch_ms": round(batch * 1000, 3),
+    }
+
+
+def _describe(n_estimators: int, max_depth: int | None, quantize: bool) -> str:
+    parts = [f"trees={n_estimators}"]
+    if max_depth is not None:
+        parts.append(f"depth<={max_depth}")
+    if quantize:
+        parts.append("float32")
+    return ",".join(parts)
+
+
+def compact(
+    pipeline: Pipeline,
+    X_train: pd.DataFrame,
+    y_train: np.ndarray,
+    X_test: pd.DataFrame,
+    y_test: np.ndarray,
+    max_r2_loss: float = 0.01,
+    validation_fraction: float = 0.2,
+    repeats: int = 100,
+) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+    """Select compaction variants on validation data, report them on test.
+
+    Args:
+        pipeline: The fitted pipeline to compact.
+        X_train, y_train: The split ``pipeline`` was trained on; a
+            ``validation_fraction`` slice of it is held out to refit a
+            selection clone.
+        X_test, y_test: Held-out split used for reporting only.
+
+    Returns:
+        ``(report, best)`` where ``report`` has one row per variant (the
+        uncompacted model is marked "(original)") and ``best`` is the
+        smallest variant whose validation R² is within ``max_r2_loss`` of
+        the original, or None.
+    """
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=validation_fraction, random_state=42
+    )
+    print(f"Refitting selection model on {len(X_fit)} rows ({len(X_val)} validation)...")
+    selector = clone(pipeline).fit(X_fit, y_fit)
+
+    n_total = pipeline.named_steps["model"].n_estimators_
+    sel_gbr = selector.named_steps["model"]
+    transformed = selector.named_steps["preprocessor"].transform(X_val)
+
+    # Truncation curve from staged predictions (one pass over the ensemble).
+    staged_r2 = np.array(
+        [r2_score(y_val, pred) for pred in sel_gbr.staged_predict(transformed)]
+    )
+    print(
+        f"\nStaged validation R²: best {staged_r2.max():.4f} at "
+        f"{int(staged_r2.argmax()) + 1} trees, {staged_r2[-1]:.4f} at {n_total}"
+    )
+
+    best_k = int(staged_r2.argmax()) + 1
+    counts = sorted({k for k in TRUNCATION_GRID if k < n_total} | {best_k, n_total})
+    configs = [
+        (k, depth, quantize)
+        for k in counts
+        for depth in (None, *DEPTH_GRID)
+        for quantize in (False, True)
+    ]
+
+    report = []
+    for k, depth, quantize in configs:
+        val_preds = make_variant(selector, k, depth, quantize).predict(X_val)
+        variant = make_variant(pipeline, k, depth, quantize)
+        preds = variant.predict(X_test)
+        row = {
+            "variant": _describe(k, depth, quantize),
+            "n_estimators": k,
+            "max_depth": depth,
+            "float32": quantize,
+            "val_r2": round(float(r2_score(y_val, val_preds)), 4),
+            "test_r2": round(float(r2_score(y_test, preds)), 4),
+            "test_mae": round(float(mean_absolute_error(y_test, preds)), 2),
+            "test_rmse": round(float(np.sqrt(mean_squared_error(y_test, preds))), 2),
+            "size_bytes": artifact_size(variant, COMPRESS_LEVEL),
+            "n_nodes": int(
+                sum(e.tree_.node_count for e in variant.named_steps["model"].estimators_[:, 0])
+            ),
+        }
+        row.update(measure_latency(variant, X_test, repeats))
+        report.append(row)
+
+    baseline = next(
+        r for r in report
+        if r["n_estimators"] == n_total and r["max_depth"] is None and not r["float32"]
+    )
+    baseline["variant"] += " (original)"
+    eligible = [r for r in report if r["val_r2"] >= baseline["val_r2"] - max_r2_loss]
+    best = min(eligible, key=lambda r: r["size_bytes"]) if eligible else None
+    return report, best
+
+
+def print_report(report: list[dict[str, Any]], best: dict[str, Any] | None) -> None:
+    """Print the compaction report as a fixed-width table."""
+    header = (
+        f"{'variant':34s} {'val R2':>7s} {'test R2':>7s} {'MAE (INR)':>12s} {'size KB':>9s} "
+        f"{'row ms':>8s} {'batch ms':>9s}"
+    )
+    print(f"\n{header}\n{'-' * len(header)}")
+    for r in report:
+        marker = " *" if best is not None and r is best else ""
+        print(
+            f"{r['variant']:34s} {r['val_r2']:7.4f} {r['test_r2']:7.4f} {r['test_mae']:12,.0f} "
+            f"{r['size_bytes'] / 1024:9.1f} {r['single_row_ms']:8.3f} "
+            f"{r['batch_ms']:9.3f}{marker}"
+        )
+
+
+def export_variant(pipeline: Pipeline, best: dict[str, Any], path: Path) -> Pipeline:
+    """Rebuild the selected variant, write it to ``path`` and return it."""
+    variant = make_variant(
+        pipeline, best["n_estimators"], best["max_depth"], best["float32"]
+    )
+    joblib.dump(variant, path, compress=COMPRESS_LEVEL)
+    return variant
+
+
+def cross_validate_variant(
+    pipeline: Pipeline,
+    best: dict[str, Any],
+    X_train: pd.DataFrame,
+    y_train: np.ndarray,
+    n_splits: int = 5,
+) -> np.ndarray:
+    """K-fold R² of the selected compaction applied to a model fitted per fold.
+
+    Refitting the compacted hyperparameters would not reproduce pruning or
+    quantization, so each fold fits a clone of the original pipeline and
+    compacts it the same way before scoring.
+    """
+    scores = []
+    for fit_idx, val_idx in KFold(n_splits).split(X_train):
+        fold = clone(pipeline).fit(X_train.iloc[fit_idx], y_train[fit_idx])
+        variant = make_variant(fold, best["n_estimators"], best["max_depth"], best["float32"])
+        scores.append(r2_score(y_train[val_idx], variant.predict(X_train.iloc[val_idx])))
+    return np.array(scores)
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""Content-addressed on-disk cache for cleaned / engineered DataFrames.
+
+Entries are keyed on a SHA-256 of the source CSV bytes plus the source code
+of the functions that produce the frame (and the ``repr`` of any lookup
+tables they read), so editing either the data or the cleaning logic
+invalidates the cache automatically.
+
+Each entry is a directory of one ``.npy`` file per column. Numeric columns
+are loaded with ``mmap_mode="r"``; object columns (e.g. ``Location``) are
+stored as integer codes plus a JSON list of categories.
+
+Layout::
+
+    .cache/features/
+        stats.json
+        <stage>-<key>/
+            meta.json
+            index.npy
+            col_000.npy ...
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+# Bump when the on-disk layout changes.
+CACHE_FORMAT_VERSION = 1
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "features"
+MAX_ENTRIES = 8
+
+_STATS_PATH = CACHE_DIR / "stats.json"
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(source: Path, code: Iterable[Callable | Any]) -> str:
+    """Hash the source file contents together with the producing code.
+
+    Functions contribute their source; any other entry (e.g. a module-level
+    mapping a function reads) contributes its ``repr``.
+    """
+    digest = hashlib.sha256(f"format={CACHE_FORMAT_VERSION}".encode())
+    digest.update(_file_digest(source).encode())
+    for item in code:
+        text = inspect.getsource(item) if callable(item) else repr(item)
+        digest.update(text.encode())
+    return digest.hexdigest()[:16]
+
+
+# ---------------------------------------------------------------------------
+# Stats
+# ---------------------------------------------------------------------------
+
+def _read_stats() -> dict:
+    if _STATS_PATH.exists():
+        with open(_STATS_PATH) as f:
+            return json.load(f)
+    return {"hits": 0, "misses": 0, "build_seconds": 0.0, "load_seconds": 0.0}
+
+
+def _record(hit: bool, seconds: float) -> None:
+    stats = _read_stats()
+    if hit:
+        stats["hits"] += 1
+        stats["load_seconds"] += seconds
+    else:
+        stats["misses"] += 1
+        stats["build_seconds"] += seconds
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(_STATS_PATH, "w") as f:
+        json.dump(stats, f, indent=2)
+
+
+def cache_stats() -> dict:
+    """Return hit/miss counters plus per-entry sizes."""
+    stats = _read_stats()
+    entries = []
+    if CACHE_DIR.exists():
+        for entry in sorted(CACHE_DIR.iterdir()):
+            if not (entry / "meta.json").exists():
+                continue
+            with open(entry / "meta.json") as f:
+                meta = json.load(f)
+            entries.append(
+                {
+                    "name": entry.name,
+                    "rows": meta["n_rows"],
+                    "columns": len(meta["columns"]),
+                    "bytes": sum(p.stat().st_size for p in entry.iterdir()),
+                    "created": meta["created"],
+                }
+            )
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    stats["entries"] = entries
+    stats["total_bytes"] = sum(e["bytes"] for e in entries)
+    return stats
+
+
+def clear_cache() -> None:
+    """Delete every cache entry and reset the statistics."""
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+# ---------------------------------------------------------------------------
+# Columnar read / write
+# ---------------------------------------------------------------------------
+
+def _write_entry(path: Path, df: pd.DataFrame) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        filename = f"col_{i:03d}.npy"
+        if series.dtype == object:
+            codes, categories = pd.factorize(series)
+            np.save(tmp / filename, codes.astype(np.int32))
+            columns.append(
+                {"name": name, "file": filename, "kind": "codes",
+                 "categories": categories.tolist()}
+            )
+        else:
+            np.save(tmp / filename, series.to_numpy())
+            columns.append({"name": name, "file": filename, "kind": "array"})
+    np.save(tmp / "index.npy", df.index.to_numpy())
+    with open(tmp / "meta.json", "w") as f:
+        json.dump(
+            {"columns": columns, "n_rows": len(df), "created": time.time()}, f
+        )
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+
+
+def _read_entry(path: Path) -> pd.DataFrame:
+    with open(path / "meta.json") as f:
+        meta = json.load(f)
+    data = {}
+    for column in meta["columns"]:
+        values = np.load(path / column["file"], mmap_mode="r")
+        if column["kind"] == "codes":
+            categories = np.array(column["categories"] + [np.nan], dtype=object)
+            values = categories[values]  # code -1 maps to NaN
+        data[column["name"]] = values
+    index = pd.Index(np.load(path / "index.npy"))
+    os.utime(path / "meta.json")  # LRU bookkeeping
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+def _evict(keep: int = MAX_ENTRIES) -> None:
+    entries = [e for e in CACHE_DIR.iterdir() if (e / "meta.json").exists()]
+    entries.sort(key=lambda e: (e / "meta.json").stat().st_mtime, reverse=True)
+    for stale in entries[keep:]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def cached_frame(
+    stage: str,
+    source: Path,
+    code: Iterable[Callable | Any],
+    build: Callable[[], pd.DataFrame],
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """Return ``build()``'s DataFrame, reusing an on-disk copy when valid.
+
+    Args:
+        stage: Name of the pipeline stage (part of the entry name).
+        source: Input file the frame is derived from.
+        code: Functions whose source defines how the frame is produced, plus
+            any data they depend on that lives outside their source.
+        build: Zero-argument callable computing the frame on a miss.
+        use_cache: When False, always rebuild and leave the cache untouched.
+    """
+    if not use_cache:
+        return build()
+
+    path = CACHE_DIR / f"{stage}-{cache_key(source, code)}"
+    start = time.perf_counter()
+    if (path / "meta.json").exists():
+        df = _read_entry(path)
+        _record(True, time.perf_counter() - start)
+        print(f"Feature cache hit: {path.name} ({len(df)} rows)")
+        return df
+
+    df = build()
+    _write_entry(path, df)
+    _record(False, time.perf_counter() - start)
+    _evict()
+    print(f"Feature cache stored: {path.name}")
+    return df
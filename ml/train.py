@@ -6,15 +6,26 @@ Navi Mumbai real estate dataset. It handles data cleaning,
 feature engineering, model training, evaluation, and artifact export.
 
 Usage:
-    python ml/train.py
+    python ml/train.py                  # full retrain
+    python ml/train.py --incremental    # warm-start on unseen listings only
+    python ml/train.py --no-cache       # bypass the cleaned-feature cache
+    python ml/train.py --cache-stats    # print feature cache statistics
+    python ml/train.py --compact        # train, then report compaction variants
+    python ml/train.py --compact-only --export-compact backend/model.pkl
 
 Output:
-    backend/model.pkl        - Trained sklearn pipeline
-    backend/metadata.json    - Feature metadata for API
+    backend/model.pkl              - Trained sklearn pipeline
+    backend/metadata.json          - Feature metadata for API
+    backend/train_fingerprints.npy - Hashes of raw rows already trained on
+    backend/artifacts/             - Versioned copies of incremental models
+    backend/artifacts/compaction_report.json - Accuracy / size / latency per variant
+    .cache/features/               - Cached cleaned / engineered frames
 """
 
+import argparse
 import json
 import re
+import shutil
 import warnings
 from pathlib import Path
 
@@ -22,12 +33,20 @@ import joblib
 import numpy as np
 import pandas as pd
 from sklearn.compose import ColumnTransformer
-from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.ensemble import GradientBoostingRegressor
 from sklearn.impute import SimpleImputer
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.model_selection import cross_val_score, train_test_split
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler
+from sklearn.preprocessing import (
+    LabelEncoder,
+    OneHotEncoder,
+    StandardScaler,
+    TargetEncoder,
+)
+
+from compaction import compact, cross_validate_variant, export_variant, print_report
+from feature_cache import cache_stats, cached_frame, clear_cache
 
 warnings.filterwarnings("ignore")
 
@@ -41,6 +60,8 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 
 MODEL_PATH = OUTPUT_DIR / "model.pkl"
 METADATA_PATH = OUTPUT_DIR / "metadata.json"
+FINGERPRINTS_PATH = OUTPUT_DIR / "train_fingerprints.npy"
+ARTIFACTS_DIR = OUTPUT_DIR / "artifacts"
 
 
 # ---------------------------------------------------------------------------
@@ -98,31 +119,70 @@ def clean_binary(value: str | float) -> int | None:
     return None
 
 
+# Spelling variant -> canonical name (also exported to metadata for the API)
+LOCATION_ALIASES = {
+    "Cbd Belapur": "CBD Belapur",
+    "Kharghar": "Kharghar",
+    "Panvel": "Panvel",
+    " Panvel": "Panvel",
+}
+
+
 def normalize_location(value: str | float) -> str | None:
     """Standardize location names."""
     if pd.isna(value):
         return None
     s = str(value).strip().title()
-    # Alias normalization
-    aliases = {
-        "Cbd Belapur": "CBD Belapur",
-        "Kharghar": "Kharghar",
-        "Panvel": "Panvel",
-        " Panvel": "Panvel",
-    }
     s = s.strip()
-    return aliases.get(s, s)
+    return LOCATION_ALIASES.get(s, s)
 
 
 # ---------------------------------------------------------------------------
 # Load and clean data
 # ---------------------------------------------------------------------------
 
-def load_and_clean() -> pd.DataFrame:
-    """Load CSV and return a cleaned DataFrame."""
-    print(f"Loading data from: {DATA_PATH}")
-    df = pd.read_csv(DATA_PATH)
+def load_raw(path: Path = DATA_PATH) -> pd.DataFrame:
+    """Load the uncleaned listings CSV."""
+    print(f"Loading data from: {path}")
+    df = pd.read_csv(path)
     print(f"Raw shape: {df.shape}")
+    return df
+
+
+def fingerprint_rows(df: pd.DataFrame) -> np.ndarray:
+    """Return a stable 64-bit hash per raw row (index excluded)."""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def load_fingerprints(use_cache: bool = True) -> np.ndarray:
+    """Return the sorted unique raw-row fingerprints (cached on disk)."""
+    frame = cached_frame(
+        "fingerprints",
+        DATA_PATH,
+        [load_raw, fingerprint_rows],
+        lambda: pd.DataFrame({"fingerprint": np.unique(fingerprint_rows(load_raw()))}),
+        use_cache,
+    )
+    return frame["fingerprint"].to_numpy()
+
+
+def load_and_clean(use_cache: bool = True) -> pd.DataFrame:
+    """Load CSV and return a cleaned DataFrame (cached on disk)."""
+    return cached_frame(
+        "clean", DATA_PATH, CLEANING_CODE, lambda: clean(load_raw()), use_cache
+    )
+
+
+def clean(df: pd.DataFrame, price_bounds: tuple[float, float] | None = None) -> pd.DataFrame:
+    """Clean raw listings.
+
+    Args:
+        df: Raw listings as read from the CSV.
+        price_bounds: Fixed (min, max) price filter. When omitted the 1st and
+            99th percentiles of ``df`` are used, which is only meaningful for
+            the full dataset; incremental batches pass the training range.
+    """
+    df = df.copy()
 
     # --- Price ---
     df["Actual_Price"] = df["Actual_Price"].apply(clean_price)
@@ -159,8 +219,11 @@ def load_and_clean() -> pd.DataFrame:
     df = df[df["Actual_Price"] > 0]
     df = df[df["Area_sqft"] > 0]
     # Remove extreme outliers (IQR-based)
-    Q1 = df["Actual_Price"].quantile(0.01)
-    Q3 = df["Actual_Price"].quantile(0.99)
+    if price_bounds is None:
+        Q1 = df["Actual_Price"].quantile(0.01)
+        Q3 = df["Actual_Price"].quantile(0.99)
+    else:
+        Q1, Q3 = price_bounds
     df = df[(df["Actual_Price"] >= Q1) & (df["Actual_Price"] <= Q3)]
     # Remove negative areas
     df = df[df["Area_sqft"] > 50]
@@ -174,6 +237,19 @@ def load_and_clean() -> pd.DataFrame:
     return df
 
 
+# Functions whose source is hashed into the feature cache key, plus the
+# alias table normalize_location reads (hashed by repr).
+CLEANING_CODE = [
+    clean_price,
+    clean_bhk,
+    clean_floor,
+    clean_binary,
+    normalize_location,
+    LOCATION_ALIASES,
+    clean,
+]
+
+
 # ---------------------------------------------------------------------------
 # Feature engineering
 # ---------------------------------------------------------------------------
@@ -193,6 +269,17 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def load_features(use_cache: bool = True) -> pd.DataFrame:
+    """Return the cleaned, feature-engineered dataset (cached on disk)."""
+    return cached_frame(
+        "features",
+        DATA_PATH,
+        CLEANING_CODE + [engineer_features],
+        lambda: engineer_features(load_and_clean(use_cache)),
+        use_cache,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Pipeline construction
 # ---------------------------------------------------------------------------
@@ -216,8 +303,25 @@ ALL_FEATURES = NUMERIC_FEATURES + CATEGORICAL_FEATURES
 TARGET = "Actual_Price"
 
 
-def build_pipeline() -> Pipeline:
-    """Build sklearn Pipeline with preprocessing + model."""
+LOCATION_ENCODINGS = ("onehot", "target")
+
+
+def build_preprocessor(location_encoding: str = "onehot") -> ColumnTransformer:
+    """Imputation + scaling for numeric features and an encoder for location.
+
+    ``onehot`` adds one dense column per location. ``target`` replaces the
+    location with a single cross-fitted, smoothed mean-price column, so the
+    feature matrix width does not grow with the number of locations.
+    """
+    if location_encoding == "onehot":
+        encoder = ("onehot", OneHotEncoder(handle_unknown="ignore", sparse_output=False))
+    elif location_encoding == "target":
+        encoder = ("target", TargetEncoder(target_type="continuous", random_state=42))
+    else:
+        raise ValueError(
+            f"Unknown location encoding {location_encoding!r}; "
+            f"expected one of {LOCATION_ENCODINGS}"
+        )
     numeric_transformer = Pipeline(
         steps=[
             ("imputer", SimpleImputer(strategy="median")),
@@ -227,16 +331,20 @@ def build_pipeline() -> Pipeline:
     categorical_transformer = Pipeline(
         steps=[
             ("imputer", SimpleImputer(strategy="most_frequent")),
-            ("onehot", OneHotEncoder(handle_unknown="ignore", sparse_output=False)),
+            encoder,
         ]
     )
-    preprocessor = ColumnTransformer(
+    return ColumnTransformer(
         transformers=[
             ("num", numeric_transformer, NUMERIC_FEATURES),
             ("cat", categorical_transformer, CATEGORICAL_FEATURES),
         ]
     )
-    model = GradientBoostingRegressor(
+
+
+def build_model() -> GradientBoostingRegressor:
+    """The production regressor and its hyperparameters."""
+    return GradientBoostingRegressor(
         n_estimators=300,
         learning_rate=0.08,
         max_depth=5,
@@ -245,14 +353,45 @@ def build_pipeline() -> Pipeline:
         subsample=0.85,
         random_state=42,
     )
-    pipeline = Pipeline(steps=[("preprocessor", preprocessor), ("model", model)])
-    return pipeline
+
+
+def build_pipeline(model=None, location_encoding: str = "onehot") -> Pipeline:
+    """Build sklearn Pipeline with preprocessing + model (default: GBR)."""
+    return Pipeline(
+        steps=[
+            ("preprocessor", build_preprocessor(location_encoding)),
+            ("model", model if model is not None else build_model()),
+        ]
+    )
 
 
 # ---------------------------------------------------------------------------
 # Training & evaluation
 # ---------------------------------------------------------------------------
 
+def transformed_feature_names(preprocessor: ColumnTransformer) -> list[str]:
+    """Names of the model input columns, e.g. ``Location_Vashi`` for one-hot."""
+    categorical = preprocessor.named_transformers_["cat"]
+    if "onehot" in categorical.named_steps:
+        return NUMERIC_FEATURES + categorical.named_steps["onehot"].get_feature_names_out(
+            CATEGORICAL_FEATURES
+        ).tolist()
+    return NUMERIC_FEATURES + CATEGORICAL_FEATURES
+
+
+def top_feature_importances(pipeline: Pipeline, n: int = 10) -> dict[str, float] | None:
+    """The ``n`` largest model feature importances, or None if the model has none."""
+    model = pipeline.named_steps["model"]
+    if not hasattr(model, "feature_importances_"):
+        return None
+    importances = zip(
+        transformed_feature_names(pipeline.named_steps["preprocessor"]),
+        model.feature_importances_.tolist(),
+    )
+    top = sorted(importances, key=lambda x: x[1], reverse=True)[:n]
+    return {name: round(value, 4) for name, value in top}
+
+
 def evaluate(y_true: np.ndarray, y_pred: np.ndarray, split: str = "Test"):
     """Print evaluation metrics."""
     mae = mean_absolute_error(y_true, y_pred)
@@ -267,28 +406,142 @@ def evaluate(y_true: np.ndarray, y_pred: np.ndarray, split: str = "Test"):
     return {"mae": mae, "rmse": rmse, "r2": r2}
 
 
-def train():
+# Request-level numeric inputs monitored for drift by the API.
+DRIFT_FEATURES = [
+    "Area_sqft",
+    "BHK",
+    "Bathrooms",
+    "Floor",
+    "Total_Floors",
+    "Age_of_Property",
+    "Parking",
+    "Lift",
+]
+
+
+def reference_distributions(X: pd.DataFrame, n_bins: int = 10) -> dict:
+    """Compact per-feature reference histograms for drift monitoring.
+
+    Continuous features are cut at their deciles; features with few distinct
+    values (BHK, Parking, ...) get one bin per value. Bin 0 and the last bin
+    count values outside the training min/max. Binning must match
+    ``bin_index`` in backend/services/drift.py.
+    """
+    numeric = {}
+    for col in DRIFT_FEATURES:
+        values = X[col].dropna().to_numpy(dtype=float)
+        distinct = np.unique(values)
+        if len(distinct) <= 2 * n_bins:
+            cuts = (distinct[:-1] + distinct[1:]) / 2
+        else:
+            cuts = np.quantile(values, np.linspace(0, 1, n_bins + 1))[1:-1]
+        cuts = np.unique(cuts.round(4))
+        bins = np.searchsorted(cuts, values, side="right") + 1
+        counts = np.bincount(bins, minlength=len(cuts) + 3)
+        numeric[col] = {
+            "cuts": cuts.tolist(),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "proportions": (counts / counts.sum()).round(6).tolist(),
+        }
+    location = X["Location"].value_counts(normalize=True).sort_index()
+    return {
+        "samples": int(len(X)),
+        "numeric": numeric,
+        "location": {k: round(float(v), 6) for k, v in location.items()},
+    }
+
+
+def fallback_price_table(X: pd.DataFrame, y: np.ndarray, min_count: int = 5) -> dict:
+    """Median price per sqft by location and BHK for degraded API responses.
+
+    The API serves ``area_sqft * rate`` when the model misses a request
+    deadline, using the most specific level with at least ``min_count``
+    training rows: location + BHK, then location, then all data.
+    """
+    df = pd.DataFrame(
+        {
+            "Location": X["Location"].to_numpy(),
+            "BHK": X["BHK"].to_numpy(),
+            "rate": y / X["Area_sqft"].to_numpy(),
+        }
+    ).dropna()
+    df["BHK"] = df["BHK"].astype(int)
+
+    def medians(grouped) -> pd.Series:
+        stats = grouped["rate"].agg(["median", "size"])
+        return stats.loc[stats["size"] >= min_count, "median"].round(2)
+
+    by_location_bhk: dict[str, dict[str, float]] = {}
+    for (location, bhk), rate in medians(df.groupby(["Location", "BHK"])).items():
+        by_location_bhk.setdefault(location, {})[str(bhk)] = float(rate)
+    return {
+        "min_count": min_count,
+        "overall": round(float(df["rate"].median()), 2),
+        "by_location": {k: float(v) for k, v in medians(df.groupby("Location")).items()},
+        "by_location_bhk": by_location_bhk,
+    }
+
+
+def _parse_version(version: str) -> tuple[int, int, int]:
+    major, minor, patch = (version.split(".") + ["0", "0"])[:3]
+    return int(major), int(minor), int(patch)
+
+
+def next_model_version(level: str = "patch") -> str:
+    """Allocate a model version above every version already issued.
+
+    Considers the served metadata and every ``artifacts/model-<version>.pkl``
+    (including incremental runs that were not promoted), so versions are
+    never reused. Full retrains bump ``minor``, incremental and compaction
+    exports bump ``patch``; the first model ever trained is 1.0.0.
+    """
+    issued = [
+        _parse_version(path.stem.removeprefix("model-"))
+        for path in ARTIFACTS_DIR.glob("model-*.pkl")
+        if re.fullmatch(r"model-\d+\.\d+\.\d+", path.stem)
+    ]
+    if METADATA_PATH.exists():
+        with open(METADATA_PATH) as f:
+            issued.append(_parse_version(json.load(f).get("model_version", "1.0.0")))
+    if not issued:
+        return "1.0.0"
+    major, minor, patch = max(issued)
+    if level == "minor":
+        return f"{major}.{minor + 1}.0"
+    return f"{major}.{minor}.{patch + 1}"
+
+
+def split_dataset(df: pd.DataFrame):
+    """Return the fixed train/test split used for training and evaluation."""
+    X = df[ALL_FEATURES].copy()
+    y = df[TARGET].values
+    return train_test_split(X, y, test_size=0.2, random_state=42)
+
+
+def train(
+    use_cache: bool = True,
+    run_compaction: bool = False,
+    max_r2_loss: float = 0.01,
+    export_path: Path | None = None,
+    location_encoding: str = "onehot",
+):
     """Full training pipeline."""
     # 1. Load & clean
-    df = load_and_clean()
-    df = engineer_features(df)
+    df = load_features(use_cache)
 
     # 2. Prepare features
-    X = df[ALL_FEATURES].copy()
     y = df[TARGET].values
-
-    print(f"\nFeature matrix shape: {X.shape}")
+    print(f"\nFeature matrix shape: {df[ALL_FEATURES].shape}")
     print(f"Target range: INR {y.min():,.0f} - INR {y.max():,.0f}")
 
     # 3. Split
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
-    )
+    X_train, X_test, y_train, y_test = split_dataset(df)
     print(f"\nTrain: {X_train.shape[0]} | Test: {X_test.shape[0]}")
 
     # 4. Build & train pipeline
-    pipeline = build_pipeline()
-    print("\nTraining GradientBoostingRegressor...")
+    pipeline = build_pipeline(location_encoding=location_encoding)
+    print(f"\nTraining GradientBoostingRegressor ({location_encoding} location encoding)...")
     pipeline.fit(X_train, y_train)
 
     # 5. Evaluate
@@ -304,21 +557,9 @@ def train():
     print(f"  CV R² mean: {cv_scores.mean():.4f} ± {cv_scores.std():.4f}")
 
     # 7. Feature importance (from GBR)
-    gbr = pipeline.named_steps["model"]
-    ohe_cats = (
-        pipeline.named_steps["preprocessor"]
-        .named_transformers_["cat"]
-        .named_steps["onehot"]
-        .get_feature_names_out(CATEGORICAL_FEATURES)
-        .tolist()
-    )
-    feature_names = NUMERIC_FEATURES + ohe_cats
-    importances = dict(
-        zip(feature_names, gbr.feature_importances_.tolist())
-    )
-    top_features = sorted(importances.items(), key=lambda x: x[1], reverse=True)[:10]
+    top_features = top_feature_importances(pipeline)
     print("\nTop 10 Feature Importances:")
-    for name, imp in top_features:
+    for name, imp in top_features.items():
         print(f"  {name:40s}: {imp:.4f}")
 
     # 8. Export model
@@ -328,12 +569,18 @@ def train():
     # 9. Export metadata
     locations = sorted(df["Location"].dropna().unique().tolist())
     metadata = {
-        "model_version": "1.0.0",
+        "model_version": next_model_version("minor"),
         "algorithm": "GradientBoostingRegressor",
         "numeric_features": NUMERIC_FEATURES,
         "categorical_features": CATEGORICAL_FEATURES,
         "all_features": ALL_FEATURES,
         "locations": locations,
+        "location_encoding": location_encoding,
+        "location_aliases": {
+            alias.strip(): name
+            for alias, name in LOCATION_ALIASES.items()
+            if name in locations and alias.strip() != name
+        },
         "bhk_options": [1, 2, 3, 4],
         "target": TARGET,
         "train_metrics": {k: round(v, 2) for k, v in train_metrics.items()},
@@ -348,13 +595,306 @@ def train():
             "mean": int(y.mean()),
             "median": int(np.median(y)),
         },
-        "top_features": {k: round(v, 4) for k, v in top_features},
+        "top_features": top_features,
+        "reference_distributions": reference_distributions(X_train),
+        "fallback_price_per_sqft": fallback_price_table(X_train, y_train),
     }
     with open(METADATA_PATH, "w") as f:
         json.dump(metadata, f, indent=2)
     print(f"Metadata saved to: {METADATA_PATH}")
+
+    # 10. Record which raw rows this model has seen
+    np.save(FINGERPRINTS_PATH, load_fingerprints(use_cache))
+    print(f"Row fingerprints saved to: {FINGERPRINTS_PATH}")
+
+    # 11. Optional compaction report / export
+    if run_compaction:
+        run_compaction_stage(
+            pipeline, X_train, y_train, X_test, y_test, max_r2_loss, export_path
+        )
     print("\nTraining complete!")
 
 
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+
+COMPACTION_REPORT_PATH = ARTIFACTS_DIR / "compaction_report.json"
+
+
+def run_compaction_stage(
+    pipeline: Pipeline,
+    X_train: pd.DataFrame,
+    y_train: np.ndarray,
+    X_test: pd.DataFrame,
+    y_test: np.ndarray,
+    max_r2_loss: float,
+    export_path: Path | None = None,
+):
+    """Report compaction variants and optionally export the smallest one."""
+    if not isinstance(pipeline.named_steps["model"], GradientBoostingRegressor):
+        print("\nCompaction only applies to GradientBoostingRegressor; skipping.")
+        return
+    print(f"\nEvaluating compaction variants (max R² loss {max_r2_loss})...")
+    report, best = compact(pipeline, X_train, y_train, X_test, y_test, max_r2_loss)
+    print_report(report, best)
+
+    ARTIFACTS_DIR.mkdir(exist_ok=True)
+    with open(COMPACTION_REPORT_PATH, "w") as f:
+        json.dump(
+            {"max_r2_loss": max_r2_loss, "selected": best, "variants": report},
+            f,
+            indent=2,
+        )
+    print(f"\nCompaction report saved to: {COMPACTION_REPORT_PATH}")
+
+    if best is None:
+        print("No variant stays within the configured accuracy loss.")
+        return
+    print(f"Smallest variant within budget: {best['variant']}")
+    if export_path is None:
+        return
+
+    variant = export_variant(pipeline, best, export_path)
+    print(f"Compacted model saved to: {export_path}")
+    if export_path.resolve() == MODEL_PATH.resolve() and METADATA_PATH.exists():
+        # Every model-dependent field must describe the compacted variant.
+        train_metrics = evaluate(y_train, variant.predict(X_train), "Train")
+        print("\nRunning 5-fold cross-validation of the compacted variant...")
+        cv_scores = cross_validate_variant(pipeline, best, X_train, y_train)
+        print(f"  CV R² mean: {cv_scores.mean():.4f} ± {cv_scores.std():.4f}")
+        with open(METADATA_PATH) as f:
+            metadata = json.load(f)
+        metadata["model_version"] = next_model_version("patch")
+        metadata["train_metrics"] = {k: round(v, 2) for k, v in train_metrics.items()}
+        metadata["test_metrics"]["r2"] = round(best["test_r2"], 2)
+        metadata["test_metrics"]["mae"] = round(best["test_mae"], 2)
+        metadata["test_metrics"]["rmse"] = round(best["test_rmse"], 2)
+        metadata["cv_r2_mean"] = round(float(cv_scores.mean()), 4)
+        metadata["cv_r2_std"] = round(float(cv_scores.std()), 4)
+        metadata["top_features"] = top_feature_importances(variant)
+        metadata["compaction"] = {
+            k: best[k]
+            for k in ("variant", "n_estimators", "max_depth", "float32", "val_r2", "size_bytes")
+        }
+        with open(METADATA_PATH, "w") as f:
+            json.dump(metadata, f, indent=2)
+        print(f"Metadata updated: {METADATA_PATH}")
+
+
+def compact_saved_model(
+    use_cache: bool, max_r2_loss: float, export_path: Path | None = None
+):
+    """Run the compaction stage on the already-exported model."""
+    pipeline = joblib.load(MODEL_PATH)
+    X_train, X_test, y_train, y_test = split_dataset(load_features(use_cache))
+    run_compaction_stage(
+        pipeline, X_train, y_train, X_test, y_test, max_r2_loss, export_path
+    )
+
+
+# ---------------------------------------------------------------------------
+# Incremental (warm-start) retraining
+# ---------------------------------------------------------------------------
+
+def train_incremental(
+    data_path: Path = DATA_PATH,
+    extra_estimators: int = 50,
+    holdout_fraction: float = 0.2,
+    min_new_rows: int = 20,
+):
+    """Extend the shipped booster with trees fitted on unseen listings only.
+
+    Rows already trained on are recognised by their raw-row fingerprint, so
+    only new listings are cleaned. The most recent ``holdout_fraction`` of
+    them (by file order) is held out for validation; the fitted preprocessor
+    is reused unchanged and ``extra_estimators`` stages are added to the
+    GradientBoostingRegressor via ``warm_start``. The extended model is
+    written as a new versioned artifact and promoted only if it does not
+    regress on the held-out slice.
+    """
+    if not (MODEL_PATH.exists() and METADATA_PATH.exists() and FINGERPRINTS_PATH.exists()):
+        raise FileNotFoundError(
+            "Incremental training needs an existing model, metadata and "
+            "row fingerprints. Run `python ml/train.py` once first."
+        )
+
+    pipeline = joblib.load(MODEL_PATH)
+    if not isinstance(pipeline.named_steps["model"], GradientBoostingRegressor):
+        raise ValueError(
+            "Incremental training warm-starts a GradientBoostingRegressor, but "
+            f"{MODEL_PATH.name} holds a {type(pipeline.named_steps['model']).__name__}. "
+            "Run a full retrain (`python ml/train.py`) instead."
+        )
+    with open(METADATA_PATH) as f:
+        metadata = json.load(f)
+    seen = np.load(FINGERPRINTS_PATH)
+
+    # 1. Select unseen raw rows and clean only those
+    raw = load_raw(data_path)
+    fingerprints = fingerprint_rows(raw)
+    is_new = ~np.isin(fingerprints, seen)
+    print(f"New rows: {int(is_new.sum())} of {len(raw)}")
+    if is_new.sum() < min_new_rows:
+        print(f"Fewer than {min_new_rows} new rows; nothing to do.")
+        return
+
+    price_range = metadata["price_range_inr"]
+    df = clean(raw[is_new], price_bounds=(price_range["min"], price_range["max"]))
+    df = engineer_features(df)
+    if len(df) < min_new_rows:
+        print(f"Only {len(df)} new rows survived cleaning (need {min_new_rows}); "
+              "nothing to do.")
+        return
+    unknown = sorted(set(df["Location"]) - set(metadata["locations"]))
+    if unknown:
+        print(f"Warning: unseen locations {unknown} get the unknown-location "
+              "encoding; run a full retrain to learn them.")
+
+    # 2. Hold out the most recent slice of the new rows
+    n_holdout = max(1, int(len(df) * holdout_fraction))
+    fit_df, holdout_df = df.iloc[:-n_holdout], df.iloc[-n_holdout:]
+    print(f"Incremental train: {len(fit_df)} | Recent holdout: {len(holdout_df)}")
+
+    preprocessor = pipeline.named_steps["preprocessor"]
+    gbr = pipeline.named_steps["model"]
+    before = evaluate(
+        holdout_df[TARGET].values, pipeline.predict(holdout_df[ALL_FEATURES]),
+        "Holdout (before)",
+    )
+
+    # 3. Warm-start additional boosting stages on the new rows
+    n_before = gbr.n_estimators_
+    gbr.set_params(warm_start=True, n_estimators=n_before + extra_estimators)
+    print(f"\nAdding {extra_estimators} estimators to {n_before} via warm start...")
+    gbr.fit(preprocessor.transform(fit_df[ALL_FEATURES]), fit_df[TARGET].values)
+    gbr.set_params(warm_start=False)
+
+    after = evaluate(
+        holdout_df[TARGET].values, pipeline.predict(holdout_df[ALL_FEATURES]),
+        "Holdout (after)",
+    )
+
+    # 4. Export versioned artifact + metadata
+    version = next_model_version("patch")
+    metadata.update(
+        {
+            "model_version": version,
+            "training_samples": metadata["training_samples"] + len(fit_df),
+            "n_estimators": int(gbr.n_estimators_),
+            "incremental": {
+                "base_version": metadata.get("model_version", "1.0.0"),
+                "new_rows": len(df),
+                "holdout_rows": len(holdout_df),
+                "extra_estimators": extra_estimators,
+                "holdout_before": {k: round(v, 4) for k, v in before.items()},
+                "holdout_after": {k: round(v, 4) for k, v in after.items()},
+            },
+        }
+    )
+    ARTIFACTS_DIR.mkdir(exist_ok=True)
+    versioned_model = ARTIFACTS_DIR / f"model-{version}.pkl"
+    versioned_metadata = ARTIFACTS_DIR / f"metadata-{version}.json"
+    joblib.dump(pipeline, versioned_model)
+    with open(versioned_metadata, "w") as f:
+        json.dump(metadata, f, indent=2)
+    print(f"\nVersioned model saved to: {versioned_model}")
+
+    if after["r2"] < before["r2"]:
+        print("Holdout R² regressed; keeping the currently served model.")
+        return
+
+    shutil.copyfile(versioned_model, MODEL_PATH)
+    shutil.copyfile(versioned_metadata, METADATA_PATH)
+    # Holdout rows stay unseen so the next refresh trains on them.
+    consumed = np.setdiff1d(fingerprints[is_new], fingerprints[holdout_df.index])
+    np.save(FINGERPRINTS_PATH, np.union1d(seen, consumed))
+    print(f"Promoted model {version} to: {MODEL_PATH}")
+    print("\nIncremental training complete!")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Warm-start the existing model on listings not seen before",
+    )
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=DATA_PATH,
+        help="Listings CSV for incremental mode (default: bundled dataset)",
+    )
+    parser.add_argument(
+        "--extra-estimators",
+        type=int,
+        default=50,
+        help="Boosting stages to add in incremental mode",
+    )
+    parser.add_argument(
+        "--location-encoding",
+        choices=LOCATION_ENCODINGS,
+        default="onehot",
+        help="How to encode location: one column per location, or one target-encoded "
+        "column (scales to thousands of locations)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-clean the CSV instead of reusing the cached feature matrix",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="After training, evaluate truncation / pruning / float32 variants",
+    )
+    parser.add_argument(
+        "--compact-only",
+        action="store_true",
+        help="Run the compaction stage on the existing model without retraining",
+    )
+    parser.add_argument(
+        "--max-r2-loss",
+        type=float,
+        default=0.01,
+        help="Largest test R² drop a compacted variant may have (default 0.01)",
+    )
+    parser.add_argument(
+        "--export-compact",
+        type=Path,
+        default=None,
+        help="Write the smallest variant within --max-r2-loss to this path",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Print feature cache statistics and exit",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Delete all cached feature matrices and exit",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    train()
+    args = parse_args()
+    if args.cache_stats:
+        print(json.dumps(cache_stats(), indent=2))
+    elif args.clear_cache:
+        clear_cache()
+        print("Feature cache cleared.")
+    elif args.incremental:
+        train_incremental(args.data, args.extra_estimators)
+    elif args.compact_only:
+        compact_saved_model(not args.no_cache, args.max_r2_loss, args.export_compact)
+    else:
+        train(
+            use_cache=not args.no_cache,
+            run_compaction=args.compact or args.export_compact is not None,
+            max_r2_loss=args.max_r2_loss,
+            export_path=args.export_compact,
+            location_encoding=args.location_encoding,
+        )